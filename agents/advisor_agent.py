@@ -5,12 +5,13 @@ from datetime import datetime
 from dotenv import load_dotenv
 
 # LangChain / LangGraph Imports
-from langchain_openai import ChatOpenAI, OpenAIEmbeddings
-from langchain_core.tools import tool
-from langchain_core.messages import BaseMessage, SystemMessage, HumanMessage
+from langchain_openai import ChatOpenAI
+from langchain_core.tools import StructuredTool
+from langchain_core.messages import BaseMessage, SystemMessage, HumanMessage, AIMessage, AIMessageChunk, ToolMessage
 from langchain.agents import create_agent
 from langchain_qdrant import QdrantVectorStore
-from qdrant_client import QdrantClient, models
+from qdrant_client import AsyncQdrantClient, QdrantClient, models
+from agents.embedding_cache import cached_embeddings
 
 load_dotenv()
 QDRANT_URL = os.getenv("QDRANT_ENDPOINT")
@@ -18,7 +19,7 @@ QDRANT_API_KEY = os.getenv("QDRANT_API_KEY")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
 
-embeddings = OpenAIEmbeddings(model="text-embedding-3-small", api_key=OPENAI_API_KEY)
+embeddings = cached_embeddings("text-embedding-3-small", api_key=OPENAI_API_KEY)
 
 
 vector_store = QdrantVectorStore.from_existing_collection(
@@ -30,78 +31,104 @@ vector_store = QdrantVectorStore.from_existing_collection(
 
 client = vector_store.client
 
-client.create_payload_index(
-    collection_name="uploaded_cvs",
-    field_name="metadata.session_id",
-    field_schema=models.PayloadSchemaType.KEYWORD,
-    wait=True
-)
+# metadata.session_id is indexed (tenant keyword index) by data/qdrant_schema.py, not at startup
+
+async_client = AsyncQdrantClient(url=QDRANT_URL, api_key=QDRANT_API_KEY)
+
+def _cv_filter(session_id: str) -> models.Filter:
+    return models.Filter(
+        must=[
+            models.FieldCondition(
+                key="metadata.session_id",
+                match=models.MatchValue(value=session_id)
+            )
+        ]
+    )
+
+
+def _format_cvs(points) -> str:
+    if not points:
+        print("No CVs found for this session ID.")
+        return "No CVs found for this session ID."
+
+    # Sort by creation time (descending) -> Newest first
+    sorted_points = sorted(
+        points, 
+        key=lambda x: x.payload.get("metadata", {}).get("created", 0), 
+        reverse=True
+    )
+
+    results = []
+    for i, point in enumerate(sorted_points):
+        payload = point.payload
+        metadata = payload.get("metadata", {})
+        created_ts = metadata.get("created", 0)
+        date_str = datetime.fromtimestamp(created_ts).strftime('%Y-%m-%d %H:%M:%S')
+        
+        summary = payload.get("page_content", "No summary available.")
+        full_contents = metadata.get("cv_contents", "No detailed contents available.")
+
+        label = "MOST RECENT CV" if i == 0 else f"OLDER CV (Uploaded: {date_str})"
+        
+        entry = (
+            f"=== {label} ===\n"
+            f"Date Uploaded: {date_str}\n"
+            f"Summary: {summary}\n"
+            f"Full Content Snippet: {full_contents}...\n"
+            f"=======================\n"
+        )
+        results.append(entry)
+        print(entry)
+
+    return "\n".join(results)
 
-# Tool to retrieve user data
-@tool
-def review_user_cv(session_id: str) -> str:
-    """
-    Retrieves the user's CV(s) from the database using their session_id.
-    Returns the CV summaries and contents.
-    """
 
+def _review_user_cv(session_id: str) -> str:
     print("---- retrieving user CV for advisor chatbot")
 
     try:
         points, _ = client.scroll(
             collection_name="uploaded_cvs",
-            scroll_filter=models.Filter(
-                must=[
-                    models.FieldCondition(
-                        key="metadata.session_id",
-                        match=models.MatchValue(value=session_id)
-                    )
-                ]
-            ),
+            scroll_filter=_cv_filter(session_id),
             limit=10,  # Assumption: User won't have more than 10 CVs uploaded in one session
             with_payload=True
         )
+        return _format_cvs(points)
 
-        if not points:
-            print("No CVs found for this session ID.")
-            return "No CVs found for this session ID."
+    except Exception as e:
+        print(f"Error retrieving CV: {str(e)}")
+        return f"Error retrieving CV: {str(e)}"
 
-        # Sort by creation time (descending) -> Newest first
-        sorted_points = sorted(
-            points, 
-            key=lambda x: x.payload.get("metadata", {}).get("created", 0), 
-            reverse=True
-        )
 
-        results = []
-        for i, point in enumerate(sorted_points):
-            payload = point.payload
-            metadata = payload.get("metadata", {})
-            created_ts = metadata.get("created", 0)
-            date_str = datetime.fromtimestamp(created_ts).strftime('%Y-%m-%d %H:%M:%S')
-            
-            summary = payload.get("page_content", "No summary available.")
-            full_contents = metadata.get("cv_contents", "No detailed contents available.")
-
-            label = "MOST RECENT CV" if i == 0 else f"OLDER CV (Uploaded: {date_str})"
-            
-            entry = (
-                f"=== {label} ===\n"
-                f"Date Uploaded: {date_str}\n"
-                f"Summary: {summary}\n"
-                f"Full Content Snippet: {full_contents}...\n"
-                f"=======================\n"
-            )
-            results.append(entry)
-            print(entry)
+async def _areview_user_cv(session_id: str) -> str:
+    print("---- retrieving user CV for advisor chatbot")
 
-        return "\n".join(results)
+    try:
+        points, _ = await async_client.scroll(
+            collection_name="uploaded_cvs",
+            scroll_filter=_cv_filter(session_id),
+            limit=10,  # Assumption: User won't have more than 10 CVs uploaded in one session
+            with_payload=True
+        )
+        return _format_cvs(points)
 
     except Exception as e:
         print(f"Error retrieving CV: {str(e)}")
         return f"Error retrieving CV: {str(e)}"
 
 
+# Tool to retrieve user data (sync for invoke, coroutine for ainvoke)
+review_user_cv = StructuredTool.from_function(
+    func=_review_user_cv,
+    coroutine=_areview_user_cv,
+    name="review_user_cv",
+    description=(
+        "Retrieves the user's CV(s) from the database using their session_id.\n"
+        "Returns the CV summaries and contents."
+    ),
+)
+
+
 
 # ======================================= Agent =======================================
 llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.3, api_key=OPENAI_API_KEY)
@@ -116,17 +143,21 @@ advisor_agent = create_agent(
         3. In those cases, you MUST call the 'review_user_cv' tool to fetch the raw, full text of the CV to ensure you don't miss details."""
 )
 
-# Endpoint Function revealed to fastAPI app
-def invoke_advisor(messages: List[Dict[str, str]], session_id: str) -> Dict[str, Any]:
-    
+def _advisor_inputs(messages: List[Dict[str, str]], session_id: str) -> Dict[str, Any]:
     system_instruction = SystemMessage(
         content=f"SYSTEM CONTEXT: The current session_id is '{session_id}'. When calling tools, you MUST use this specific session_id."
     )
     
-    formatted_inputs = {"messages": [system_instruction] + messages}
+    return {"messages": [system_instruction] + messages}
+
+
+# Endpoint Function revealed to fastAPI app
+async def invoke_advisor(messages: List[Dict[str, str]], session_id: str) -> Dict[str, Any]:
+    
+    formatted_inputs = _advisor_inputs(messages, session_id)
 
-    # Invoke the agent
-    result = advisor_agent.invoke(formatted_inputs)
+    # Invoke the agent (async: LLM and Qdrant calls don't hold a worker thread while waiting)
+    result = await advisor_agent.ainvoke(formatted_inputs)
     
     # Extract the last message (the AI's response)
     last_message = result["messages"][-1]
@@ -142,4 +173,31 @@ def invoke_advisor(messages: List[Dict[str, str]], session_id: str) -> Dict[str,
     return {
         "response": last_message.content,
         "full_messages": full_messages # Return full history
-    }
\ No newline at end of file
+    }
+
+
+# Streaming variant for /invoke-advisor/stream
+async def stream_advisor(messages: List[Dict[str, str]], session_id: str):
+    """
+    Yields the agent loop as it happens:
+    ("tool_call", tool_call dict) when the model decides to call a tool,
+    ("tool_result", ToolMessage) when the tool returns,
+    ("token", str) for every chunk of text the model generates.
+    """
+    formatted_inputs = _advisor_inputs(messages, session_id)
+
+    # "messages" streams LLM tokens, "updates" gives each node's finished messages (tool calls/results)
+    async for mode, chunk in advisor_agent.astream(formatted_inputs, stream_mode=["messages", "updates"]):
+        if mode == "messages":
+            message, _metadata = chunk
+            if isinstance(message, AIMessageChunk) and isinstance(message.content, str) and message.content:
+                yield "token", message.content
+            continue
+
+        for update in chunk.values():
+            for message in (update or {}).get("messages", []):
+                if isinstance(message, AIMessage) and message.tool_calls:
+                    for tool_call in message.tool_calls:
+                        yield "tool_call", tool_call
+                elif isinstance(message, ToolMessage):
+                    yield "tool_result", message
@@ -0,0 +1,70 @@
+import os
+import threading
+from hashlib import sha256
+
+from agents.llm_cache import MemoryCacheBackend, SQLiteCacheBackend
+
+# Cache of complete CV analyses (document_agent), keyed by the hash of the uploaded PDF bytes.
+# Re-uploading the same file skips read_doc and assess_user (the two LLM calls); best_jobs are kept too,
+# and re-searched with the cached summary when the jobs catalog changed since they were found.
+
+ANALYSIS_CACHE_BACKEND = os.getenv("ANALYSIS_CACHE_BACKEND", "memory")  # memory | sqlite
+ANALYSIS_CACHE_PATH = os.getenv("ANALYSIS_CACHE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "analysis_cache.db"))
+ANALYSIS_CACHE_TTL = int(os.getenv("ANALYSIS_CACHE_TTL", 7 * 24 * 60 * 60))
+ANALYSIS_CACHE_MAX_ENTRIES = int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", 2000))
+
+# Re-run find_jobs for a cached analysis whose best_jobs came from an older catalog version
+ANALYSIS_CACHE_REFRESH_JOBS = os.getenv("ANALYSIS_CACHE_REFRESH_JOBS", "true").lower() == "true"
+
+NAMESPACE = "cv_analysis"
+
+# What an entry holds: enough to answer /analyze-cv and to re-upsert the CV for a new session
+CACHED_FIELDS = ("summary", "user_name", "cv_contents", "best_jobs", "assessment", "catalog_version")
+
+
+def file_hash(file_bytes: bytes) -> str:
+    return sha256(file_bytes).hexdigest()
+
+
+class AnalysisCache:
+    def __init__(self, backend, ttl: int = ANALYSIS_CACHE_TTL):
+        self.backend = backend
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get(self, key: str) -> dict | None:
+        entry = self.backend.get(NAMESPACE, key)
+        self._count("hits" if entry is not None else "misses")
+        return entry
+
+    def set(self, key: str, analysis: dict):
+        # best_jobs must already be dicts (jobs_to_dicts), the sqlite backend stores JSON
+        entry = {field: analysis.get(field) for field in CACHED_FIELDS}
+        self.backend.set(NAMESPACE, key, entry, None, self.ttl)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+def build_analysis_cache() -> AnalysisCache:
+    if ANALYSIS_CACHE_BACKEND == "sqlite":
+        backend = SQLiteCacheBackend(ANALYSIS_CACHE_PATH, ANALYSIS_CACHE_MAX_ENTRIES)
+    elif ANALYSIS_CACHE_BACKEND == "memory":
+        backend = MemoryCacheBackend(ANALYSIS_CACHE_MAX_ENTRIES)
+    else:
+        raise ValueError(f"Unknown ANALYSIS_CACHE_BACKEND '{ANALYSIS_CACHE_BACKEND}', expected 'memory' or 'sqlite'")
+
+    return AnalysisCache(backend)
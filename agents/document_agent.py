@@ -1,28 +1,36 @@
-import pymupdf
 import os
 import json
 import time
+import asyncio
 import base64
 from hashlib import md5
 from typing_extensions import TypedDict
 from langgraph.graph import StateGraph
 from langchain_core.messages import SystemMessage
-from langchain_core.documents import Document
-from langchain_openai import ChatOpenAI, OpenAIEmbeddings
-from langchain_qdrant import QdrantVectorStore
-from qdrant_client import QdrantClient
+from langchain_openai import ChatOpenAI
+from qdrant_client import AsyncQdrantClient, QdrantClient, models
 from qdrant_client.http import models as qm
 from dotenv import load_dotenv
+from agents.graph_registry import register_graph, get_graph
+from agents.embedding_cache import cached_embeddings
+from agents.jobs_vector_store import build_jobs_vector_store, build_async_jobs_vector_store
+from agents.job_record import Job, jobs_from_dicts, jobs_to_dicts
+from agents.analysis_cache import build_analysis_cache, file_hash, ANALYSIS_CACHE_REFRESH_JOBS
+from agents.pdf_text import aextract_text
 
 # TypedDict definition of State
 class State(TypedDict):
     summary: str
     user_name: str
     cv_contents: str
-    best_jobs: list[dict]
+    best_jobs: list[Job]
+    summary_vector: list[float]
     file_bytes: bytes
     session_id: str
     assessment: str
+    file_hash: str
+    cache_hit: bool
+    catalog_version: str | None
 
 
 load_dotenv()
@@ -31,66 +39,156 @@ qdrant_key = os.getenv("QDRANT_API_KEY")
 
 model = ChatOpenAI(model="gpt-4o-mini", temperature=0.3, api_key=os.getenv("OPENAI_API_KEY"))
 client = QdrantClient(url=qdrant_url, api_key=qdrant_key)
-embedding_model = OpenAIEmbeddings(model="text-embedding-3-small")
+embedding_model = cached_embeddings("text-embedding-3-small")
 
-# Create collection if it doesn't exist
-if not client.collection_exists("uploaded_cvs"):
-    print("Creating 'uploaded_cvs' collection...")
+# 'uploaded_cvs' (vectors + payload indexes) is created by data/qdrant_schema.py (python -m data.qdrant_schema)
 
-    client.create_collection(
-        collection_name="uploaded_cvs",
-        vectors_config=qm.VectorParams(size=1536, distance=qm.Distance.COSINE)
-    )
-
-CV_VectorStore = QdrantVectorStore(
-    client=client,
-    collection_name="uploaded_cvs",
-    embedding=embedding_model,
-)
+CV_COLLECTION = "uploaded_cvs"
 
-Jobs_VectorStore = QdrantVectorStore(
-    client=client,
-    collection_name="Jobs_Documents",
-    embedding=embedding_model,
-)
+# Request path is async end to end (graph ainvoke, async OpenAI calls, AsyncQdrantClient)
+async_client = AsyncQdrantClient(url=qdrant_url, api_key=qdrant_key)
+Jobs_VectorStore = build_async_jobs_vector_store(build_jobs_vector_store(client, embedding_model), async_client)
 
-# ================================= Functions =================================
-def convert_bytes(file: bytes) -> str:
-    doc = pymupdf.open(stream=file, filetype="pdf")
-    text = ""
-    for page in doc:
-        text = text + page.get_text()
-    return text
+# Finished analyses by PDF hash (agents/analysis_cache.py)
+analysis_cache = build_analysis_cache()
 
+# Graph-internal state, not part of the /analyze-cv response
+INTERNAL_FIELDS = ("summary_vector", "file_hash", "cache_hit", "catalog_version")
 
-def analysis_compile(intial_state: State):
-    # compiles main graph, passes State, and starts the program
+# ================================= Functions =================================
+def build_analysis_graph() -> StateGraph:
     document_agent = StateGraph(State)
 
     # Define graph
+    document_agent.add_node("read_cache", read_cache)
     document_agent.add_node("read_doc", read_doc)
+    document_agent.add_node("embed_summary", embed_summary)
     document_agent.add_node("construct_vector", construct_vector)
     document_agent.add_node("find_jobs", find_jobs)
     document_agent.add_node("assess_user", assess_user)
+    document_agent.add_node("write_cache", write_cache)
+
+    document_agent.set_entry_point("read_cache")
+
+    # A cached analysis skips the CV reading LLM call
+    document_agent.add_conditional_edges(
+        "read_cache",
+        choose_source,
+        {
+            "read_doc": "read_doc",
+            "embed_summary": "embed_summary"
+        }
+    )
+
+    document_agent.add_edge("read_doc", "embed_summary")
+
+    # Fan-out: the CV upsert is only read later by the advisor, so it runs alongside find_jobs
+    # instead of in front of it. The graph ends once both branches are done.
+    document_agent.add_conditional_edges(
+        "embed_summary",
+        choose_branches,
+        ["construct_vector", "find_jobs"]
+    )
 
-    document_agent.set_entry_point("read_doc")
+    # Refreshed jobs of a cached analysis keep the cached assessment
+    document_agent.add_conditional_edges(
+        "find_jobs",
+        choose_after_jobs,
+        {
+            "assess_user": "assess_user",
+            "write_cache": "write_cache"
+        }
+    )
+    document_agent.add_edge("assess_user", "write_cache")
 
-    document_agent.add_edge("read_doc", "construct_vector")
-    document_agent.add_edge("construct_vector", "find_jobs")
-    document_agent.add_edge("find_jobs", "assess_user")
+    document_agent.set_finish_point("construct_vector")
+    document_agent.set_finish_point("write_cache")
 
-    document_agent.set_finish_point("assess_user")
+    return document_agent
 
-    app = document_agent.compile()
-    response = app.invoke(intial_state)
 
+def _to_response(state: dict) -> dict:
+    # Jobs back to dicts, graph-internal fields dropped
+    response = {key: value for key, value in state.items() if key not in INTERNAL_FIELDS}
+    if "best_jobs" in response:
+        response["best_jobs"] = jobs_to_dicts(response["best_jobs"])
     return response
 
 
-def read_doc(State: State):
+async def analysis_compile(intial_state: State):
+    # passes State to the graph compiled at import time (end of this module) and starts the program
+    app = get_graph("analysis")
+    response = await app.ainvoke({**intial_state, "best_jobs": jobs_from_dicts(intial_state.get("best_jobs", []))})
+
+    return _to_response({"best_jobs": [], **response})
+
+
+async def stream_analysis(intial_state: State):
+    # Yields (node name, state update of that node) as each node of the graph finishes:
+    # read_doc (user_name, summary), embed_summary, construct_vector and find_jobs (best_jobs) in parallel,
+    # assess_user (assessment), write_cache. A cached analysis comes in the read_cache update instead.
+    app = get_graph("analysis")
+    initial = {**intial_state, "best_jobs": jobs_from_dicts(intial_state.get("best_jobs", []))}
+
+    async for update in app.astream(initial, stream_mode="updates"):
+        for node, partial in update.items():
+            yield node, _to_response(partial or {})
+
+
+def choose_source(State: State):
+    return "embed_summary" if State["cache_hit"] else "read_doc"
+
+
+def choose_branches(State: State):
+    # A fresh cache hit still needs the CV upserted for this session, but not the job search
+    if State["cache_hit"] and State["best_jobs"]:
+        return ["construct_vector"]
+    return ["construct_vector", "find_jobs"]
+
+
+def choose_after_jobs(State: State):
+    return "write_cache" if State["cache_hit"] else "assess_user"
+
+
+async def read_cache(State: State):
+    key = file_hash(base64.b64decode(State["file_bytes"]))
+
+    cached = await asyncio.to_thread(analysis_cache.get, key)
+    if cached is None:
+        return {"file_hash": key, "cache_hit": False, "catalog_version": None}
+
+    # Jobs found in an older catalog are dropped, find_jobs searches again with the cached summary
+    catalog_version = await Jobs_VectorStore.acatalog_version() if ANALYSIS_CACHE_REFRESH_JOBS else None
+    stale = ANALYSIS_CACHE_REFRESH_JOBS and cached["catalog_version"] != catalog_version
+
+    return {
+        "summary": cached["summary"],
+        "user_name": cached["user_name"],
+        "cv_contents": cached["cv_contents"],
+        "best_jobs": [] if stale else jobs_from_dicts(cached["best_jobs"]),
+        "assessment": cached["assessment"],
+        "file_hash": key,
+        "cache_hit": True,
+        "catalog_version": catalog_version,
+    }
+
+
+async def write_cache(State: State):
+    # A fresh analysis is stamped only now, so a cache miss never waits on the catalog version
+    catalog_version = State["catalog_version"]
+    if ANALYSIS_CACHE_REFRESH_JOBS and not State["cache_hit"]:
+        catalog_version = await Jobs_VectorStore.acatalog_version()
+
+    analysis = {**State, "best_jobs": jobs_to_dicts(State["best_jobs"]), "catalog_version": catalog_version}
+    await asyncio.to_thread(analysis_cache.set, State["file_hash"], analysis)
+    return {}
+
+
+async def read_doc(State: State):
     byte_file = base64.b64decode(State["file_bytes"])
 
-    cv_contents = convert_bytes(byte_file)
+    # Page/character budget and whitespace normalization in agents/pdf_text.py; large files go to a process pool
+    cv_contents = await aextract_text(byte_file)
 
     system_prompt = SystemMessage(
         f"""You are a CV analyzer. Your role is to extract the user's fullname and provide a summary analysis of the CV that adequately encapsulates 
@@ -120,7 +218,7 @@ def read_doc(State: State):
         """ 
         )
     
-    response = model.invoke([system_prompt]).content
+    response = (await model.ainvoke([system_prompt])).content
 
     try:
         clean_json = response.replace("```json", "").replace("```", "")
@@ -134,7 +232,14 @@ def read_doc(State: State):
     return {"summary": response, "user_name": user_name, "cv_contents": cv_contents}
 
 
-def construct_vector(State: State):
+async def embed_summary(State: State):
+    # The summary is embedded once; construct_vector and find_jobs both use this vector
+    # (for a cached analysis the embedding cache usually already has it)
+    [vector] = await embedding_model.aembed_documents([State["summary"]])
+    return {"summary_vector": vector}
+
+
+async def construct_vector(State: State):
     # Store CV summary + CV contents as metadata. Embed CV summary for vector points
     _metadata = {
         "cv_contents": State["cv_contents"],
@@ -142,66 +247,40 @@ def construct_vector(State: State):
         "session_id": State["session_id"]
     }
 
-    unique_identifier = State["summary"].lower().encode('utf-8')
+    # One point per CV file and session: re-uploads overwrite it, other sessions keep their own copy
+    unique_identifier = f"{State['session_id']}_{State['file_hash']}".encode('utf-8')
     unique_id = md5(unique_identifier).hexdigest()
 
-    doc = Document(
-        page_content=State["summary"],
-        metadata=_metadata,
-        id=unique_id,
+    # Same point layout QdrantVectorStore.add_documents wrote (page_content + metadata payload)
+    await async_client.upsert(
+        collection_name=CV_COLLECTION,
+        points=[models.PointStruct(
+            id=unique_id,
+            vector=State["summary_vector"],
+            payload={"page_content": State["summary"], "metadata": _metadata},
+        )],
     )
 
-    qdrant = CV_VectorStore.add_documents([doc])
-
-    # print(qdrant)
-
     return {}
 
 
-def find_jobs(State: State):
+async def find_jobs(State: State):
 
-    qdrant = Jobs_VectorStore.similarity_search_with_score(
-        query=State["summary"],
+    qdrant = await Jobs_VectorStore.asimilarity_search_with_score_by_vector(
+        embedding=State["summary_vector"],
         k=10,
+        query=State["summary"],  # BM25 side of a hybrid search
     )
 
-    list_of_jobs = []
-
-    for points in qdrant:
-        # print(point[0].payload["metadata"])
-        Document = points[0]
-        metadata = Document.metadata
-        page_content = Document.page_content
-
-        if "Job Description:" in page_content:
-            job_desc = page_content.split("Job Description: ", 1)[1].strip()
-        else:
-            job_desc = page_content
-
-        Job = {
-            'job_title': metadata["job_title"],
-            'company_name': metadata["company_name"],
-            'work_type': metadata["work_type"],
-            'work_style': metadata["work_style"],
-            'location': metadata["location"],
-            'salary': metadata["salary"],
-            'company_name': metadata["company_name"],
-            'job_title': metadata["job_title"],
-            'job_description': job_desc
-        }
-
-        list_of_jobs.append(Job)
+    list_of_jobs = [Job.from_document(document) for document, _score in qdrant]
 
     return {"best_jobs": list_of_jobs}
 
 
-def assess_user(State: State):
+async def assess_user(State: State):
     recommended_jobs = ""
     for job in State["best_jobs"]:
-        company = job["company_name"]
-        job_title = job["job_title"]
-
-        recommended_jobs += f"{job_title} at {company}\n"
+        recommended_jobs += f"{job.job_title} at {job.company_name}\n"
 
 
     system_prompt = SystemMessage(
@@ -222,5 +301,8 @@ def assess_user(State: State):
         """
     )
 
-    response = model.invoke([system_prompt]).content.strip('"')
+    response = (await model.ainvoke([system_prompt])).content.strip('"')
     return {"assessment": response}
+
+
+register_graph("analysis", build_analysis_graph())
@@ -0,0 +1,162 @@
+import os
+import time
+import asyncio
+import sqlite3
+import threading
+from hashlib import sha256
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_openai import OpenAIEmbeddings
+
+# Disk-backed cache in front of the OpenAI embeddings, shared by every agent in the process.
+# Repeated search queries and re-uploaded CV summaries cost a local SQLite lookup instead of a network call.
+
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "embedding_cache.db"))
+
+# 1536-dim float32 vectors are ~6 KB each, so 20k entries stay around 120 MB on disk
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", 20_000))
+
+
+class EmbeddingStore:
+    def __init__(self, path: str = EMBEDDING_CACHE_PATH, max_entries: int = EMBEDDING_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.abspath(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model     TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                vector    BLOB NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (model, text_hash)
+            );
+            CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings (last_used);
+        """)
+
+    def get_many(self, model: str, hashes: list[str]) -> dict[str, list[float]]:
+        # Chunked, to stay under SQLite's bound-parameter limit for large ingestion batches
+        found = {}
+        for start in range(0, len(hashes), 500):
+            found.update(self._get_chunk(model, hashes[start:start + 500]))
+        return found
+
+    def _get_chunk(self, model: str, hashes: list[str]) -> dict[str, list[float]]:
+        if not hashes:
+            return {}
+
+        placeholders = ", ".join("?" for _ in hashes)
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND text_hash IN ({placeholders})",
+                [model, *hashes]
+            ).fetchall()
+
+            if rows:
+                self._conn.execute(
+                    f"UPDATE embeddings SET last_used = ? WHERE model = ? AND text_hash IN ({placeholders})",
+                    [time.time(), model, *hashes]
+                )
+
+        return {text_hash: np.frombuffer(vector, dtype=np.float32).tolist() for text_hash, vector in rows}
+
+    def set_many(self, model: str, items: dict[str, list[float]]):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?)",
+                [(model, text_hash, np.asarray(vector, dtype=np.float32).tobytes(), now) for text_hash, vector in items.items()]
+            )
+            # Size bound: drop the least recently used vectors
+            self._conn.execute(
+                """DELETE FROM embeddings WHERE rowid IN (
+                    SELECT rowid FROM embeddings ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                )""",
+                (self.max_entries,)
+            )
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper keyed by (model, sha256(text)). Only texts missing from the store are sent
+    to the underlying model, in a single batch.
+    """
+
+    def __init__(self, underlying: Embeddings, model: str, store: EmbeddingStore):
+        self.underlying = underlying
+        self.model = model
+        self.store = store
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        return sha256(text.encode("utf-8")).hexdigest()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        hashes = [self.text_hash(text) for text in texts]
+        cached = self.store.get_many(self.model, list(set(hashes)))
+
+        missing = {text_hash: text for text_hash, text in zip(hashes, texts) if text_hash not in cached}
+        if missing:
+            vectors = self.underlying.embed_documents(list(missing.values()))
+            new = dict(zip(missing.keys(), vectors))
+            self.store.set_many(self.model, new)
+            cached.update(new)
+
+        return [cached[text_hash] for text_hash in hashes]
+
+    def embed_query(self, text: str) -> list[float]:
+        text_hash = self.text_hash(text)
+        cached = self.store.get_many(self.model, [text_hash])
+        if text_hash in cached:
+            return cached[text_hash]
+
+        vector = self.underlying.embed_query(text)
+        self.store.set_many(self.model, {text_hash: vector})
+        return vector
+
+    # Async variants for the async request path: the SQLite lookups/inserts run in a thread so they
+    # don't block the event loop, misses use the model's async client
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        hashes = [self.text_hash(text) for text in texts]
+        cached = await asyncio.to_thread(self.store.get_many, self.model, list(set(hashes)))
+
+        missing = {text_hash: text for text_hash, text in zip(hashes, texts) if text_hash not in cached}
+        if missing:
+            vectors = await self.underlying.aembed_documents(list(missing.values()))
+            new = dict(zip(missing.keys(), vectors))
+            await asyncio.to_thread(self.store.set_many, self.model, new)
+            cached.update(new)
+
+        return [cached[text_hash] for text_hash in hashes]
+
+    async def aembed_query(self, text: str) -> list[float]:
+        text_hash = self.text_hash(text)
+        cached = await asyncio.to_thread(self.store.get_many, self.model, [text_hash])
+        if text_hash in cached:
+            return cached[text_hash]
+
+        vector = await self.underlying.aembed_query(text)
+        await asyncio.to_thread(self.store.set_many, self.model, {text_hash: vector})
+        return vector
+
+
+_store = None
+_instances = {}
+_instances_lock = threading.Lock()
+
+
+def cached_embeddings(model: str = "text-embedding-3-small", api_key: str | None = None) -> CachedEmbeddings:
+    # One wrapper per (model, api_key) and one SQLite store per process. The vectors only depend on the
+    # model, so every wrapper of a model shares its cached entries whichever key pays for the misses.
+    global _store
+    with _instances_lock:
+        if _store is None:
+            _store = EmbeddingStore()
+
+        if (model, api_key) not in _instances:
+            underlying = OpenAIEmbeddings(model=model, api_key=api_key) if api_key else OpenAIEmbeddings(model=model)
+            _instances[(model, api_key)] = CachedEmbeddings(underlying, model, _store)
+
+        return _instances[(model, api_key)]
@@ -0,0 +1,24 @@
+# Compiled LangGraph apps, built once per process.
+# Compiled graphs are stateless between invocations (no checkpointer), so one instance can
+# serve every request; rebuilding the StateGraph and calling .compile() per request is pure overhead.
+
+_graphs = {}
+
+
+def register_graph(name: str, graph):
+    if name in _graphs:
+        raise ValueError(f"Graph '{name}' is already registered")
+
+    _graphs[name] = graph.compile()
+    return _graphs[name]
+
+
+def get_graph(name: str):
+    try:
+        return _graphs[name]
+    except KeyError:
+        raise KeyError(f"Graph '{name}' is not registered. Registered graphs: {list(_graphs)}") from None
+
+
+def registered_graphs() -> list[str]:
+    return list(_graphs)
@@ -0,0 +1,164 @@
+import re
+import hashlib
+from dataclasses import dataclass
+
+# One job as it flows through the agents (RAG_query, SQL_query, find_jobs, python_filter).
+# Filter keys and salary bounds are computed once when the job is loaded, instead of on every
+# python_filter pass; to_dict() gives back the dict shape the API and the Streamlit pages use.
+
+UNDISCLOSED_SALARY = "Tidak Ditampilkan"
+
+
+def job_key(job_title: str, company_name: str, location: str) -> str:
+    # md5 of "title_company_location": Qdrant point id (data/ingest_jobs.py), jobs.job_key (data/preprocess_data.py) and Job.id
+    unique_identifier = f"{job_title}_{company_name}_{str(location).replace(chr(10), ' ')}".lower()
+    return hashlib.md5(unique_identifier.encode("utf-8")).hexdigest()
+
+
+def _parse_amount(part: str) -> int | None:
+    digits = re.sub(r"\D", "", part)
+    return int(digits) if digits else None
+
+
+def parse_salary_bounds(salary_str: str) -> tuple[int | None, int | None]:
+    """
+    "Rp 12.000.000 – Rp 18.000.000 per month" -> (12000000, 18000000); undisclosed -> (None, None).
+    Salaries are split on any dash variant (–, —, -); a single amount is both bounds.
+    """
+    if not salary_str or UNDISCLOSED_SALARY in salary_str:
+        return None, None
+
+    parts = re.split(r"[–—-]", salary_str)
+    min_salary = _parse_amount(parts[0])
+    max_salary = _parse_amount(parts[-1]) if len(parts) > 1 else min_salary
+
+    # SQL rows use 0 for "not disclosed"
+    min_salary = min_salary or None
+    max_salary = max_salary or min_salary
+
+    return min_salary, max_salary
+
+
+def _description_from(page_content: str) -> str:
+    if "Job Description:" in page_content:
+        return page_content.split("Job Description: ", 1)[1].strip()
+    return page_content
+
+
+@dataclass(slots=True, frozen=True)
+class Job:
+    id: str
+    job_title: str
+    company_name: str
+    work_type: str
+    work_style: str
+    location: str
+    salary: str
+    job_description: str
+
+    # Precomputed for python_filter
+    work_style_key: str
+    work_type_key: str
+    location_key: str
+    min_salary: int | None
+    max_salary: int | None
+
+    @classmethod
+    def create(cls, id: str | None, job_title, company_name, work_type, work_style, location, salary, job_description,
+               min_salary: int | None = None, max_salary: int | None = None, parse_salary: bool = True) -> "Job":
+        job_title, company_name, location = str(job_title), str(company_name), str(location)
+        salary = str(salary)
+
+        # parse_salary=False: the bounds are already known, even when both are None (undisclosed)
+        if parse_salary and min_salary is None and max_salary is None:
+            min_salary, max_salary = parse_salary_bounds(salary)
+
+        return cls(
+            id=id or job_key(job_title, company_name, location),
+            job_title=job_title,
+            company_name=company_name,
+            work_type=str(work_type),
+            work_style=str(work_style),
+            location=location,
+            salary=salary,
+            job_description=str(job_description),
+            work_style_key=str(work_style).strip().lower(),
+            work_type_key=str(work_type).strip().lower(),
+            location_key=location.lower(),
+            min_salary=min_salary or None,
+            max_salary=max_salary or None,
+        )
+
+    @classmethod
+    def from_dict(cls, job: dict) -> "Job":
+        # Jobs sent back by the frontend (the shape produced by to_dict); their salary bounds are reused
+        return cls.create(
+            id=job.get("id"),
+            job_title=job.get("job_title", ""),
+            company_name=job.get("company_name", ""),
+            work_type=job.get("work_type", ""),
+            work_style=job.get("work_style", ""),
+            location=job.get("location", ""),
+            salary=job.get("salary", ""),
+            job_description=job.get("job_description", ""),
+            min_salary=job.get("min_salary"),
+            max_salary=job.get("max_salary"),
+            parse_salary="min_salary" not in job and "max_salary" not in job,
+        )
+
+    @classmethod
+    def from_document(cls, document) -> "Job":
+        # Jobs_Documents point (QdrantVectorStore / LocalJobIndex); ingested points carry integer salary bounds
+        metadata = document.metadata
+        point_id = metadata.get("_id") or document.id
+
+        return cls.create(
+            id=str(point_id).replace("-", "") if point_id else None,
+            job_title=metadata["job_title"],
+            company_name=metadata["company_name"],
+            work_type=metadata["work_type"],
+            work_style=metadata["work_style"],
+            location=metadata["location"],
+            salary=metadata["salary"],
+            job_description=_description_from(document.page_content),
+            min_salary=metadata.get("min_salary"),
+            max_salary=metadata.get("max_salary"),
+        )
+
+    @classmethod
+    def from_row(cls, row) -> "Job":
+        # Row of the SQLite jobs table (data/job_repository.py)
+        return cls.create(
+            id=row["job_key"],
+            job_title=row["job_title"],
+            company_name=row["company_name"],
+            work_type=row["work_type"],
+            work_style=row["work_style"],
+            location=row["clean_location"],
+            salary=f"""{row["min_salary"]} - {row["max_salary"]}""",
+            job_description=row["job_description"],
+            min_salary=row["min_salary"],
+            max_salary=row["max_salary"],
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            'job_title': self.job_title,
+            'company_name': self.company_name,
+            'work_type': self.work_type,
+            'work_style': self.work_style,
+            'location': self.location,
+            'salary': self.salary,
+            'job_description': self.job_description,
+            'id': self.id,
+            'min_salary': self.min_salary,
+            'max_salary': self.max_salary,
+        }
+
+
+def jobs_from_dicts(jobs: list[dict | Job]) -> list[Job]:
+    return [job if isinstance(job, Job) else Job.from_dict(job) for job in jobs]
+
+
+def jobs_to_dicts(jobs: list[dict | Job]) -> list[dict]:
+    return [job.to_dict() if isinstance(job, Job) else job for job in jobs]
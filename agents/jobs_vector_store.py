@@ -0,0 +1,192 @@
+import os
+import re
+import time
+import zlib
+from collections import Counter
+
+from langchain_core.embeddings import Embeddings
+from langchain_qdrant import QdrantVectorStore, RetrievalMode, SparseEmbeddings, SparseVector
+from langchain_core.documents import Document
+from qdrant_client import AsyncQdrantClient, QdrantClient, models
+from agents.local_vector_index import LocalJobIndex, local_index_available
+
+JOBS_COLLECTION = "Jobs_Documents"
+SPARSE_VECTOR_NAME = "bm25"
+
+# Collection metadata key written by data/ingest_jobs.py after every ingest; read through a short-lived memo
+CATALOG_VERSION_KEY = "catalog_version"
+CATALOG_VERSION_TTL = int(os.getenv("CATALOG_VERSION_TTL", 60))
+
+# Serve job searches from the in-process NumPy index (agents/local_vector_index.py) instead of Qdrant Cloud
+USE_LOCAL_INDEX = os.getenv("JOBS_LOCAL_INDEX", "false").lower() == "true"
+
+# BM25 parameters. Qdrant applies the IDF part itself (Modifier.IDF), so we only send saturated term frequencies.
+BM25_K1 = 1.2
+BM25_B = 0.75
+BM25_AVG_DOC_LENGTH = 256  # tokens in a typical Jobs_Documents page_content
+
+
+def tokenize(text: str) -> list[str]:
+    return re.findall(r"\w+", text.lower())
+
+
+class BM25SparseEmbeddings(SparseEmbeddings):
+    """
+    BM25-style sparse vectors computed locally (no model download, no API call).
+    Tokens are hashed to stable 32-bit ids, so exact terms like "SAP" or "Laravel" match even when
+    the dense embedding doesn't rank them close.
+    """
+
+    @staticmethod
+    def token_id(token: str) -> int:
+        return zlib.crc32(token.encode("utf-8"))
+
+    def _to_sparse(self, weights: dict[int, float]) -> SparseVector:
+        indices = sorted(weights)
+        return SparseVector(indices=indices, values=[weights[index] for index in indices])
+
+    def embed_documents(self, texts: list[str]) -> list[SparseVector]:
+        vectors = []
+        for text in texts:
+            tokens = tokenize(text)
+            length_norm = 1 - BM25_B + BM25_B * len(tokens) / BM25_AVG_DOC_LENGTH
+
+            weights = Counter()
+            for token, tf in Counter(tokens).items():
+                weights[self.token_id(token)] += tf * (BM25_K1 + 1) / (tf + BM25_K1 * length_norm)
+
+            vectors.append(self._to_sparse(weights))
+
+        return vectors
+
+    def embed_query(self, text: str) -> SparseVector:
+        return self._to_sparse({self.token_id(token): 1.0 for token in set(tokenize(text))})
+
+
+# Sparse vector config for the hybrid Jobs_Documents collection
+SPARSE_VECTOR_PARAMS = {"modifier": models.Modifier.IDF}
+
+
+def has_sparse_vectors(client: QdrantClient, collection_name: str = JOBS_COLLECTION) -> bool:
+    sparse_config = client.get_collection(collection_name).config.params.sparse_vectors or {}
+    return SPARSE_VECTOR_NAME in sparse_config
+
+
+def build_jobs_vector_store(client: QdrantClient, embedding: Embeddings) -> QdrantVectorStore | LocalJobIndex:
+    """
+    Vector store over Jobs_Documents. When the collection was ingested with BM25 sparse vectors
+    (python -m data.ingest_jobs), searches run dense + sparse prefetches fused with reciprocal rank
+    fusion in a single Qdrant query; otherwise they stay dense-only.
+    With JOBS_LOCAL_INDEX=true and an exported index on disk, the in-process dense index is used instead
+    (dense-only: no BM25 fusion, a warning is printed when the collection is hybrid).
+    """
+    if USE_LOCAL_INDEX:
+        if local_index_available():
+            if has_sparse_vectors(client):
+                print(f"JOBS_LOCAL_INDEX is set: job searches are dense-only, the BM25 side of the hybrid '{JOBS_COLLECTION}' search is not applied locally.")
+            return LocalJobIndex(embedding)
+        print("JOBS_LOCAL_INDEX is set but no local index was found. Run 'python -m agents.local_vector_index' first.")
+
+    if has_sparse_vectors(client):
+        return QdrantVectorStore(
+            client=client,
+            collection_name=JOBS_COLLECTION,
+            embedding=embedding,
+            retrieval_mode=RetrievalMode.HYBRID,
+            sparse_embedding=BM25SparseEmbeddings(),
+            sparse_vector_name=SPARSE_VECTOR_NAME,
+        )
+
+    print(f"'{JOBS_COLLECTION}' has no '{SPARSE_VECTOR_NAME}' sparse vectors, using dense-only search. Run 'python -m data.ingest_jobs --recreate' to enable hybrid search.")
+    return QdrantVectorStore(
+        client=client,
+        collection_name=JOBS_COLLECTION,
+        embedding=embedding,
+    )
+
+
+class AsyncJobsVectorStore:
+    """
+    Async counterpart of the QdrantVectorStore above, on AsyncQdrantClient (langchain_qdrant has no
+    native async search). Same query as the sync store: dense-only, or dense + BM25 sparse prefetches
+    fused with RRF, with the filter applied inside each prefetch. Returns the same Documents
+    (payload page_content/metadata, point id in metadata["_id"]).
+    """
+
+    def __init__(self, client: AsyncQdrantClient, embedding: Embeddings, sparse_embedding: BM25SparseEmbeddings | None = None,
+                 collection_name: str = JOBS_COLLECTION):
+        self.client = client
+        self.embedding = embedding
+        self.sparse_embedding = sparse_embedding
+        self.collection_name = collection_name
+
+        self._catalog_version = None
+        self._catalog_version_at = float("-inf")
+
+    def _document(self, point) -> Document:
+        payload = point.payload or {}
+        metadata = {**payload.get("metadata", {}), "_id": point.id, "_collection_name": self.collection_name}
+        return Document(page_content=payload.get("page_content", ""), metadata=metadata, id=str(point.id))
+
+    async def asimilarity_search_with_score(self, query: str, k: int = 4, filter: models.Filter | None = None, **kwargs) -> list[tuple[Document, float]]:
+        dense = await self.embedding.aembed_query(query)
+        return await self.asimilarity_search_with_score_by_vector(dense, k, filter, query=query)
+
+    async def asimilarity_search_with_score_by_vector(self, embedding: list[float], k: int = 4, filter: models.Filter | None = None,
+                                                      query: str | None = None, **kwargs) -> list[tuple[Document, float]]:
+        # Search with an already computed dense vector. The BM25 side needs the text, so without
+        # query a hybrid store falls back to a dense-only search.
+        dense = embedding
+
+        if self.sparse_embedding is None or query is None:
+            response = await self.client.query_points(
+                collection_name=self.collection_name,
+                query=dense,
+                query_filter=filter,
+                limit=k,
+                with_payload=True,
+            )
+        else:
+            sparse = self.sparse_embedding.embed_query(query)
+            response = await self.client.query_points(
+                collection_name=self.collection_name,
+                prefetch=[
+                    models.Prefetch(query=dense, filter=filter, limit=k),
+                    models.Prefetch(
+                        query=models.SparseVector(indices=sparse.indices, values=sparse.values),
+                        using=SPARSE_VECTOR_NAME,
+                        filter=filter,
+                        limit=k,
+                    ),
+                ],
+                query=models.FusionQuery(fusion=models.Fusion.RRF),
+                limit=k,
+                with_payload=True,
+            )
+
+        return [(self._document(point), point.score) for point in response.points]
+
+    async def asimilarity_search(self, query: str, k: int = 4, filter: models.Filter | None = None, **kwargs) -> list[Document]:
+        return [doc for doc, _ in await self.asimilarity_search_with_score(query, k, filter)]
+
+    async def acatalog_version(self) -> str | None:
+        # Stamp of the last ingest (None for a collection ingested before stamping), refetched at most every CATALOG_VERSION_TTL seconds
+        if time.monotonic() - self._catalog_version_at >= CATALOG_VERSION_TTL:
+            info = await self.client.get_collection(self.collection_name)
+            self._catalog_version = (info.config.metadata or {}).get(CATALOG_VERSION_KEY)
+            self._catalog_version_at = time.monotonic()
+        return self._catalog_version
+
+
+def build_async_jobs_vector_store(store: QdrantVectorStore | LocalJobIndex, client: AsyncQdrantClient) -> AsyncJobsVectorStore | LocalJobIndex:
+    # Mirrors whatever build_jobs_vector_store picked (local index, hybrid or dense-only)
+    if isinstance(store, LocalJobIndex):
+        return store
+
+    hybrid = store.retrieval_mode == RetrievalMode.HYBRID
+    return AsyncJobsVectorStore(
+        client,
+        store.embeddings,
+        sparse_embedding=store.sparse_embeddings if hybrid else None,
+        collection_name=store.collection_name,
+    )
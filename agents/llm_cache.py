@@ -0,0 +1,248 @@
+import os
+import re
+import json
+import asyncio
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Awaitable, Callable
+
+import numpy as np
+from pydantic import BaseModel
+
+# Cache for the search agent's structured LLM outputs (EntryFormat, FilterFormat, RAGFormat, SQLFormat, SearchPlan).
+# Those extractions only depend on the user query, so the same (normalized) query returns the cached object
+# instead of another LLM round trip. Optionally, a query whose embedding is close enough to a cached one
+# is also treated as a hit (semantic match).
+
+LLM_CACHE_BACKEND = os.getenv("LLM_CACHE_BACKEND", "memory")  # memory | sqlite
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "llm_cache.db"))
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", 24 * 60 * 60))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", 5000))
+
+# Cosine similarity needed for a semantic hit. Unset = exact (normalized) matches only.
+# Keep it high: "remote jobs in Jakarta" and "remote jobs in Bandung" are close in embedding space.
+LLM_CACHE_SIMILARITY = float(os.getenv("LLM_CACHE_SIMILARITY")) if os.getenv("LLM_CACHE_SIMILARITY") else None
+
+
+def normalize_query(query: str) -> str:
+    # "  Remote jobs in JAKARTA! " -> "remote jobs in jakarta"
+    text = re.sub(r"\s+", " ", query.lower()).strip()
+    return text.strip(" .,!?;:\"'")
+
+
+# ============================================ Backends ============================================
+
+class MemoryCacheBackend:
+    def __init__(self, max_entries: int = LLM_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # (namespace, key) -> (value, embedding, expires_at)
+        self._lock = threading.Lock()
+
+    def get(self, namespace: str, key: str):
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is None:
+                return None
+
+            value, _, expires_at = entry
+            if expires_at < time.time():
+                del self._entries[(namespace, key)]
+                return None
+
+            self._entries.move_to_end((namespace, key))
+            return value
+
+    def set(self, namespace: str, key: str, value: dict, embedding: np.ndarray | None, ttl: int):
+        with self._lock:
+            self._entries[(namespace, key)] = (value, embedding, time.time() + ttl)
+            self._entries.move_to_end((namespace, key))
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def embeddings(self, namespace: str) -> list[tuple[str, np.ndarray]]:
+        now = time.time()
+        with self._lock:
+            return [
+                (key, embedding)
+                for (entry_namespace, key), (_, embedding, expires_at) in self._entries.items()
+                if entry_namespace == namespace and embedding is not None and expires_at >= now
+            ]
+
+
+class SQLiteCacheBackend:
+    # Survives restarts and can be shared by several uvicorn workers on one host
+    def __init__(self, path: str = LLM_CACHE_PATH, max_entries: int = LLM_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.abspath(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                namespace  TEXT    NOT NULL,
+                key        TEXT    NOT NULL,
+                value      TEXT    NOT NULL,
+                embedding  BLOB,
+                expires_at REAL    NOT NULL,
+                last_used  REAL    NOT NULL,
+                PRIMARY KEY (namespace, key)
+            );
+            CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache (last_used);
+        """)
+
+    def get(self, namespace: str, key: str):
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM llm_cache WHERE namespace = ? AND key = ?", (namespace, key)
+            ).fetchone()
+            if row is None:
+                return None
+
+            if row[1] < now:
+                self._conn.execute("DELETE FROM llm_cache WHERE namespace = ? AND key = ?", (namespace, key))
+                return None
+
+            self._conn.execute("UPDATE llm_cache SET last_used = ? WHERE namespace = ? AND key = ?", (now, namespace, key))
+            return json.loads(row[0])
+
+    def set(self, namespace: str, key: str, value: dict, embedding: np.ndarray | None, ttl: int):
+        now = time.time()
+        blob = embedding.astype(np.float32).tobytes() if embedding is not None else None
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?, ?, ?, ?)",
+                (namespace, key, json.dumps(value, ensure_ascii=False), blob, now + ttl, now)
+            )
+            # LRU eviction
+            self._conn.execute(
+                """DELETE FROM llm_cache WHERE rowid IN (
+                    SELECT rowid FROM llm_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                )""",
+                (self.max_entries,)
+            )
+
+    def embeddings(self, namespace: str) -> list[tuple[str, np.ndarray]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, embedding FROM llm_cache WHERE namespace = ? AND embedding IS NOT NULL AND expires_at >= ?",
+                (namespace, time.time())
+            ).fetchall()
+
+        return [(key, np.frombuffer(blob, dtype=np.float32)) for key, blob in rows]
+
+
+# ============================================ Cache ============================================
+
+class StructuredOutputCache:
+    def __init__(self, backend, ttl: int = LLM_CACHE_TTL, embeddings=None, similarity_threshold: float | None = None):
+        self.backend = backend
+        self.ttl = ttl
+        self.embeddings = embeddings
+        self.similarity_threshold = similarity_threshold if embeddings is not None else None
+
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _normalize(self, vector) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32)
+        return vector / (np.linalg.norm(vector) or 1.0)
+
+    def _semantic_lookup(self, namespace: str, embedding: np.ndarray) -> dict | None:
+        candidates = self.backend.embeddings(namespace)
+        if not candidates:
+            return None
+
+        keys, vectors = zip(*candidates)
+        scores = np.stack(vectors) @ embedding
+        best = int(np.argmax(scores))
+
+        if scores[best] >= self.similarity_threshold:
+            return self.backend.get(namespace, keys[best])
+        return None
+
+    def get_or_invoke(self, namespace: str, query: str, schema: type[BaseModel], invoke: Callable[[], BaseModel]) -> BaseModel:
+        """
+        Returns the cached schema object for this query, or calls invoke() (the LLM) and caches its result.
+        namespace separates the different extractions, usually the schema name.
+        """
+        key = normalize_query(query)
+
+        cached = self.backend.get(namespace, key)
+        if cached is not None:
+            self._count("hits")
+            return schema.model_validate(cached)
+
+        embedding = None
+        if self.similarity_threshold is not None:
+            embedding = self._normalize(self.embeddings.embed_query(key))
+            cached = self._semantic_lookup(namespace, embedding)
+            if cached is not None:
+                self._count("semantic_hits")
+                # Stored under this exact key too, so the next identical paraphrase skips the scan
+                self.backend.set(namespace, key, cached, embedding, self.ttl)
+                return schema.model_validate(cached)
+
+        self._count("misses")
+        result = invoke()
+        self.backend.set(namespace, key, result.model_dump(), embedding, self.ttl)
+        return result
+
+    async def aget_or_invoke(self, namespace: str, query: str, schema: type[BaseModel], ainvoke: Callable[[], Awaitable[BaseModel]]) -> BaseModel:
+        """
+        Same as get_or_invoke, for the async request path: ainvoke() is awaited on a miss, and the
+        backend reads/writes (SQLite I/O, the semantic scan) run in a thread instead of on the event loop.
+        """
+        key = normalize_query(query)
+
+        cached = await asyncio.to_thread(self.backend.get, namespace, key)
+        if cached is not None:
+            self._count("hits")
+            return schema.model_validate(cached)
+
+        embedding = None
+        if self.similarity_threshold is not None:
+            embedding = self._normalize(await self.embeddings.aembed_query(key))
+            cached = await asyncio.to_thread(self._semantic_lookup, namespace, embedding)
+            if cached is not None:
+                self._count("semantic_hits")
+                await asyncio.to_thread(self.backend.set, namespace, key, cached, embedding, self.ttl)
+                return schema.model_validate(cached)
+
+        self._count("misses")
+        result = await ainvoke()
+        await asyncio.to_thread(self.backend.set, namespace, key, result.model_dump(), embedding, self.ttl)
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.semantic_hits + self.misses
+            return {
+                "hits": self.hits,
+                "semantic_hits": self.semantic_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.semantic_hits) / lookups if lookups else 0.0,
+            }
+
+
+def build_llm_cache(embeddings=None) -> StructuredOutputCache:
+    if LLM_CACHE_BACKEND == "sqlite":
+        backend = SQLiteCacheBackend()
+    elif LLM_CACHE_BACKEND == "memory":
+        backend = MemoryCacheBackend()
+    else:
+        raise ValueError(f"Unknown LLM_CACHE_BACKEND '{LLM_CACHE_BACKEND}', expected 'memory' or 'sqlite'")
+
+    return StructuredOutputCache(
+        backend,
+        embeddings=embeddings,
+        similarity_threshold=LLM_CACHE_SIMILARITY,
+    )
@@ -0,0 +1,195 @@
+import os
+import json
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from qdrant_client import QdrantClient, models
+
+# In-process dense index over the jobs catalog: every job embedding in one contiguous float32 matrix
+# (memory-mapped .npy) plus columnar metadata, searched with a single matrix-vector product.
+# The catalog is small enough for RAM, so this skips the network round trip to Qdrant Cloud.
+# Dense-only: the BM25 sparse vectors of a hybrid Jobs_Documents collection are not exported, so exact
+# keyword matches ("SAP", "Laravel") get no extra boost in local mode.
+# Built from the Qdrant collection with:  python -m agents.local_vector_index
+
+LOCAL_INDEX_DIR = os.getenv("JOBS_LOCAL_INDEX_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "jobs_index"))
+VECTORS_FILE = "vectors.npy"
+METADATA_FILE = "metadata.json"
+
+
+def export_local_index(client: QdrantClient, collection_name: str, index_dir: str = LOCAL_INDEX_DIR, batch_size: int = 256):
+    ids, page_contents, metadatas, vectors = [], [], [], []
+
+    offset = None
+    while True:
+        points, offset = client.scroll(
+            collection_name=collection_name,
+            limit=batch_size,
+            offset=offset,
+            with_payload=True,
+            with_vectors=True,
+        )
+
+        for point in points:
+            # Hybrid collections return {"": dense, "bm25": sparse}
+            vector = point.vector[""] if isinstance(point.vector, dict) else point.vector
+            ids.append(str(point.id))
+            page_contents.append(point.payload.get("page_content", ""))
+            metadatas.append(point.payload.get("metadata", {}))
+            vectors.append(vector)
+
+        if offset is None:
+            break
+
+    # Ingest stamp of the exported catalog (data/ingest_jobs.py), kept as the index's catalog version
+    catalog_version = (client.get_collection(collection_name).config.metadata or {}).get("catalog_version")
+
+    matrix = np.asarray(vectors, dtype=np.float32)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True).clip(min=1e-12)
+
+    # Columnar metadata: one list per field, aligned with the matrix rows
+    fields = sorted({key for metadata in metadatas for key in metadata})
+    columns = {field: [metadata.get(field) for metadata in metadatas] for field in fields}
+
+    os.makedirs(index_dir, exist_ok=True)
+    np.save(os.path.join(index_dir, VECTORS_FILE), matrix)
+    with open(os.path.join(index_dir, METADATA_FILE), "w", encoding="utf-8") as f:
+        json.dump({"ids": ids, "page_content": page_contents, "metadata": columns, "catalog_version": catalog_version}, f, ensure_ascii=False)
+
+    return len(ids)
+
+
+class LocalJobIndex:
+    """
+    Same search interface as QdrantVectorStore (similarity_search, similarity_search_with_score,
+    similarity_search_by_vector), including the models.Filter conditions the agents build.
+    """
+
+    def __init__(self, embedding: Embeddings, index_dir: str = LOCAL_INDEX_DIR):
+        self.embedding = embedding
+        self.vectors = np.load(os.path.join(index_dir, VECTORS_FILE), mmap_mode="r")
+
+        with open(os.path.join(index_dir, METADATA_FILE), encoding="utf-8") as f:
+            data = json.load(f)
+
+        self.ids = data["ids"]
+        self.page_content = data["page_content"]
+        self.metadata = data["metadata"]
+        self.catalog_version = data.get("catalog_version")
+
+        # Lowercased string columns for text matching, numeric columns for ranges
+        self._text_columns = {
+            field: np.array([str(value).lower() if value is not None else "" for value in values])
+            for field, values in self.metadata.items()
+        }
+        self._numeric_columns = {
+            field: np.array([value if isinstance(value, (int, float)) else np.nan for value in values], dtype=np.float64)
+            for field, values in self.metadata.items()
+            if any(isinstance(value, (int, float)) and not isinstance(value, bool) for value in values)
+        }
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _condition_mask(self, condition) -> np.ndarray:
+        field = condition.key.removeprefix("metadata.")
+        if field not in self.metadata:
+            return np.zeros(len(self), dtype=bool)
+
+        if condition.range is not None:
+            column = self._numeric_columns.get(field, np.full(len(self), np.nan))
+            mask = ~np.isnan(column)
+            bounds = condition.range
+            if bounds.gte is not None:
+                mask &= column >= bounds.gte
+            if bounds.gt is not None:
+                mask &= column > bounds.gt
+            if bounds.lte is not None:
+                mask &= column <= bounds.lte
+            if bounds.lt is not None:
+                mask &= column < bounds.lt
+            return mask
+
+        column = self._text_columns[field]
+        if isinstance(condition.match, models.MatchText):
+            return np.char.find(column, condition.match.text.lower()) >= 0
+        if isinstance(condition.match, models.MatchValue):
+            return column == str(condition.match.value).lower()
+
+        raise ValueError(f"Unsupported filter condition for the local index: {condition}")
+
+    def _filter_mask(self, filter: models.Filter | None) -> np.ndarray | None:
+        if filter is None:
+            return None
+
+        mask = np.ones(len(self), dtype=bool)
+        for condition in filter.must or []:
+            mask &= self._condition_mask(condition)
+        for condition in filter.must_not or []:
+            mask &= ~self._condition_mask(condition)
+        if filter.should:
+            should = np.zeros(len(self), dtype=bool)
+            for condition in filter.should:
+                should |= self._condition_mask(condition)
+            mask &= should
+
+        return mask
+
+    def _document(self, row: int) -> Document:
+        metadata = {field: values[row] for field, values in self.metadata.items()}
+        metadata["_id"] = self.ids[row]
+        return Document(page_content=self.page_content[row], metadata=metadata, id=self.ids[row])
+
+    def similarity_search_with_score_by_vector(self, embedding: list[float], k: int = 4, filter: models.Filter | None = None, **kwargs) -> list[tuple[Document, float]]:
+        query = np.array(embedding, dtype=np.float32)
+        query /= np.linalg.norm(query) or 1.0
+
+        scores = self.vectors @ query
+
+        mask = self._filter_mask(filter)
+        if mask is not None:
+            scores = np.where(mask, scores, -np.inf)
+
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k] if k else np.array([], dtype=int)
+        top = top[np.argsort(-scores[top])]
+
+        return [(self._document(row), float(scores[row])) for row in top if np.isfinite(scores[row])]
+
+    def similarity_search_by_vector(self, embedding: list[float], k: int = 4, filter: models.Filter | None = None, **kwargs) -> list[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score_by_vector(embedding, k, filter)]
+
+    def similarity_search_with_score(self, query: str, k: int = 4, filter: models.Filter | None = None, **kwargs) -> list[tuple[Document, float]]:
+        return self.similarity_search_with_score_by_vector(self.embedding.embed_query(query), k, filter)
+
+    def similarity_search(self, query: str, k: int = 4, filter: models.Filter | None = None, **kwargs) -> list[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k, filter)]
+
+    # Async path: only the query embedding can hit the network, the search itself is in-process
+    async def asimilarity_search_with_score(self, query: str, k: int = 4, filter: models.Filter | None = None, **kwargs) -> list[tuple[Document, float]]:
+        return self.similarity_search_with_score_by_vector(await self.embedding.aembed_query(query), k, filter)
+
+    async def asimilarity_search_with_score_by_vector(self, embedding: list[float], k: int = 4, filter: models.Filter | None = None, **kwargs) -> list[tuple[Document, float]]:
+        return self.similarity_search_with_score_by_vector(embedding, k, filter)
+
+    async def asimilarity_search(self, query: str, k: int = 4, filter: models.Filter | None = None, **kwargs) -> list[Document]:
+        return [doc for doc, _ in await self.asimilarity_search_with_score(query, k, filter)]
+
+    async def acatalog_version(self) -> str | None:
+        # The index is loaded once per process, its stamp only changes with a re-export + restart
+        return self.catalog_version
+
+
+def local_index_available(index_dir: str = LOCAL_INDEX_DIR) -> bool:
+    return all(os.path.exists(os.path.join(index_dir, name)) for name in (VECTORS_FILE, METADATA_FILE))
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    from agents.jobs_vector_store import JOBS_COLLECTION
+
+    load_dotenv()
+    qdrant_client = QdrantClient(url=os.getenv("QDRANT_ENDPOINT"), api_key=os.getenv("QDRANT_API_KEY"))
+    count = export_local_index(qdrant_client, JOBS_COLLECTION)
+    print(f"Exported {count} jobs to {os.path.abspath(LOCAL_INDEX_DIR)}")
@@ -0,0 +1,97 @@
+import os
+import re
+import asyncio
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pymupdf
+
+# Text extraction for uploaded CVs (document_agent.read_doc).
+# Pages are read up to a page and character budget (the text ends up in an LLM prompt), whitespace is
+# normalized, and large files are parsed in a process pool so they don't hold the GIL of the API worker.
+
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", 10))
+PDF_MAX_CHARS = int(os.getenv("PDF_MAX_CHARS", 20_000))
+
+# Files from this size on go to the process pool; smaller ones are parsed in a thread.
+# PyMuPDF holds the GIL while parsing, so the pool only pays off with more than one core (PDF_POOL_WORKERS > 1).
+PDF_POOL_MIN_BYTES = int(os.getenv("PDF_POOL_MIN_BYTES", 1024 * 1024))
+PDF_POOL_WORKERS = int(os.getenv("PDF_POOL_WORKERS", min(4, os.cpu_count() or 1)))
+
+PAGE_SEPARATOR = "\n\n"
+
+_SPACES = re.compile(r"[^\S\n]+")          # any whitespace except newlines (tabs, nbsp, ...)
+_BLANK_LINES = re.compile(r"\n{3,}")       # more than one empty line in a row
+
+
+def normalize_whitespace(text: str) -> str:
+    # "Skills:\t Python  \n\n\n\n SQL" -> "Skills: Python\n\nSQL"
+    text = _SPACES.sub(" ", text.replace("\r\n", "\n").replace("\r", "\n"))
+    text = "\n".join(line.strip() for line in text.split("\n"))
+    return _BLANK_LINES.sub("\n\n", text).strip()
+
+
+def extract_text(file: bytes, max_pages: int = PDF_MAX_PAGES, max_chars: int = PDF_MAX_CHARS) -> str:
+    pages = []
+    length = 0
+
+    with pymupdf.open(stream=file, filetype="pdf") as doc:
+        for page in doc.pages(0, min(max_pages, doc.page_count)):
+            text = normalize_whitespace(page.get_text())
+            if not text:
+                continue
+
+            pages.append(text)
+            length += len(text) + len(PAGE_SEPARATOR)
+
+            # Budget reached, the remaining pages are not parsed
+            if length >= max_chars:
+                break
+
+    return PAGE_SEPARATOR.join(pages)[:max_chars]
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: forking the API process would copy its event loop, client threads and locks
+            _pool = ProcessPoolExecutor(max_workers=PDF_POOL_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def _reset_pool(broken: ProcessPoolExecutor):
+    # A worker died (e.g. PyMuPDF crashed on a malformed upload); the next large file starts a fresh pool
+    global _pool
+    with _pool_lock:
+        if _pool is broken:
+            _pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+async def _extract_in_pool(file: bytes, max_pages: int, max_chars: int) -> str:
+    pool = _get_pool()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(pool, extract_text, file, max_pages, max_chars)
+    except BrokenProcessPool:
+        _reset_pool(pool)
+        raise
+
+
+async def aextract_text(file: bytes, max_pages: int = PDF_MAX_PAGES, max_chars: int = PDF_MAX_CHARS) -> str:
+    # PDF parsing is CPU work, keep it off the event loop
+    if PDF_POOL_WORKERS > 1 and len(file) >= PDF_POOL_MIN_BYTES:
+        try:
+            return await _extract_in_pool(file, max_pages, max_chars)
+        except BrokenProcessPool:
+            # One retry in a fresh pool (another upload may have killed the worker). Never in a thread:
+            # a file that crashes PyMuPDF would take the API process down with it.
+            return await _extract_in_pool(file, max_pages, max_chars)
+
+    return await asyncio.to_thread(extract_text, file, max_pages, max_chars)
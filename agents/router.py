@@ -0,0 +1,89 @@
+import re
+import threading
+from collections import Counter
+
+# Deterministic fast path for the search agent's entry_point.
+# Obvious queries ("only hybrid jobs", "find new jobs that match my CV") are routed by keyword rules;
+# anything ambiguous falls back to the LLM router. Routes match EntryFormat.entry_point.
+
+ROUTER_CONFIDENCE_THRESHOLD = 0.75
+
+# Minimum total rule weight for the winning route, so a single weak keyword never skips the LLM
+MIN_EVIDENCE = 2.0
+
+# Asking for "new"/"other" jobs means we are not building upon the current list
+NEW_JOBS = re.compile(r"\b(new|another|other|more|different|baru|lain|lainnya)\b", re.IGNORECASE)
+
+# (pattern, route, weight). Each pattern counts once per query.
+RULES = [
+    # [Build upon your current list]
+    (re.compile(r"\b(only|just|these|this list|current list|given list|my list|the list|hanya|saja|yang ini)\b", re.IGNORECASE), "python_filter", 1.0),
+    (re.compile(r"\b(filter\w*|remove|exclude|keep|hide|sort)\b", re.IGNORECASE), "python_filter", 1.0),
+    (re.compile(r"\b(hybrid|hibrid|remote|on-site|onsite|wfh|wfo|salary|gaji|paid|full[ -]time|part[ -]time|paruh waktu|kontrak|contract|kasual|casual)\b", re.IGNORECASE), "python_filter", 1.0),
+
+    # [Find new jobs based on CV]
+    (re.compile(r"\b(cv|resume|résumé|profile|my (skills|experience|background)|(match|matches|fit|fits|suit|suits) me|sesuai)\b", re.IGNORECASE), "RAG_search", 2.0),
+    (re.compile(r"\bnone of (these|them|those)\b", re.IGNORECASE), "RAG_search", 2.0),
+
+    # [Find specific jobs you want]
+    (re.compile(r"\b(search for|look for|looking for|find me|cari(kan)?)\b", re.IGNORECASE), "SQL_search", 1.0),
+    (re.compile(r"\b(analyst|analysis|engineer|developer|designer|manager|scientist|intern|internship|accountant|admin|programmer|specialist|consultant|marketing|sales|data|software|finance)\b", re.IGNORECASE), "SQL_search", 1.0),
+]
+
+
+def classify_query(query: str) -> tuple[str, float]:
+    """
+    Returns (route, confidence) for a search query. Confidence is the winning route's share of all
+    matched rule weight, and 0.0 when the query doesn't carry enough evidence to decide locally.
+    """
+    if not query or not re.search(r"[^\W\d_]", query):
+        return "Null intent", 1.0
+
+    scores = Counter()
+    for pattern, route, weight in RULES:
+        if pattern.search(query):
+            scores[route] += weight
+
+    if NEW_JOBS.search(query):
+        scores.pop("python_filter", None)
+        scores["RAG_search"] += 1.0
+        scores["SQL_search"] += 1.0
+
+    if not scores:
+        return "Null intent", 0.0
+
+    route, best = scores.most_common(1)[0]
+    if best < MIN_EVIDENCE:
+        return route, 0.0
+
+    return route, best / sum(scores.values())
+
+
+class RouterStats:
+    # Counters for how often the fast path answers instead of the LLM
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.fast_path = Counter()
+        self.llm = Counter()
+
+    def record(self, route: str, fast_path: bool):
+        with self._lock:
+            (self.fast_path if fast_path else self.llm)[route] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            fast_total = sum(self.fast_path.values())
+            llm_total = sum(self.llm.values())
+            total = fast_total + llm_total
+
+            return {
+                "total": total,
+                "fast_path": fast_total,
+                "llm_fallback": llm_total,
+                "hit_rate": fast_total / total if total else 0.0,
+                "fast_path_routes": dict(self.fast_path),
+                "llm_routes": dict(self.llm),
+            }
+
+
+router_stats = RouterStats()
@@ -1,7 +1,7 @@
 import os
 import base64
 import json
-import sqlite3
+import asyncio
 from typing_extensions import TypedDict, Literal
 from pydantic import BaseModel
 from typing import Annotated, Any
@@ -9,19 +9,27 @@ from langgraph.graph import StateGraph, END
 from langchain_core.messages import SystemMessage, AIMessage
 from langgraph.graph.message import add_messages
 from langchain_core.documents import Document
-from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+from langchain_openai import ChatOpenAI
 from langchain_qdrant import QdrantVectorStore
-from qdrant_client import QdrantClient, models
+from qdrant_client import AsyncQdrantClient, QdrantClient, models
 from qdrant_client.http import models as qm
 from dotenv import load_dotenv
+from data.job_repository import job_repository
+from agents.graph_registry import register_graph, get_graph
+from agents.router import classify_query, router_stats, ROUTER_CONFIDENCE_THRESHOLD
+from agents.llm_cache import build_llm_cache
+from agents.embedding_cache import cached_embeddings
+from agents.jobs_vector_store import build_jobs_vector_store, build_async_jobs_vector_store
+from agents.job_record import Job, jobs_from_dicts, jobs_to_dicts
 
 # TypedDict definition of State
 class State(TypedDict):
     query: str
     summary: str
-    best_jobs: list[dict]
+    best_jobs: list[Job]
     session_id: str
     messages: Annotated[list[Any], add_messages]
+    search_params: dict
 
 
 load_dotenv()
@@ -29,200 +37,124 @@ qdrant_url = os.getenv("QDRANT_ENDPOINT")
 qdrant_key = os.getenv("QDRANT_API_KEY")
 
 model = ChatOpenAI(model="gpt-4o-mini", temperature=0.3, api_key=os.getenv("OPENAI_API_KEY"))
+
+# Route + filter extraction in one structured LLM call (see plan_search) instead of two sequential ones
+SINGLE_CALL_ROUTING = os.getenv("SEARCH_SINGLE_CALL_ROUTING", "true").lower() == "true"
 client = QdrantClient(url=qdrant_url, api_key=qdrant_key)
-embedding_model = OpenAIEmbeddings(model="text-embedding-3-small")
+embedding_model = cached_embeddings("text-embedding-3-small")
 
 embeddings = embedding_model
 
-vector_store = QdrantVectorStore.from_existing_collection(
-    collection_name="Jobs_Documents",
-    url=qdrant_url,
-    api_key=qdrant_key,
-    embedding=embedding_model,
-)
-
-
-# Temporary code to setup payload indexing
-
-# from qdrant_client.models import PayloadSchemaType
-
-# client.create_payload_index(
-#     collection_name="Jobs_Documents",
-#     field_name="metadata.work_type",
-#     field_schema=PayloadSchemaType.TEXT
-# )
-
-# client.create_payload_index(
-#     collection_name="Jobs_Documents",
-#     field_name="metadata.work_style",
-#     field_schema=PayloadSchemaType.TEXT
-# )
-
-# client.create_payload_index(
-#     collection_name="Jobs_Documents",
-#     field_name="metadata.location",
-#     field_schema=PayloadSchemaType.TEXT
-# )
-
-# ============================================ Helper Functions ============================================
-
-import re
-
-def parse_min_salary(salary_str: str) -> int | None:
-    if not salary_str:
-        return None
-
-    # Case 1: undisclosed
-    if "Tidak Ditampilkan" in salary_str:
-        return None
-
-    # Normalize dash variants (–, —, -)
-    # Split on dash and keep the first part
-    first_part = re.split(r"[–—-]", salary_str)[0]
+# Structured outputs of the search agent, keyed by normalized query
+llm_cache = build_llm_cache(embeddings=embedding_model)
 
-    # Remove everything except digits
-    digits = re.sub(r"\D", "", first_part)
+# Hybrid (dense + BM25 sparse, RRF-fused) when the collection has sparse vectors
+vector_store = build_jobs_vector_store(client, embedding_model)
 
-    if not digits:
-        return None
+# Request path is async end to end (graph ainvoke, async OpenAI calls, AsyncQdrantClient)
+async_client = AsyncQdrantClient(url=qdrant_url, api_key=qdrant_key)
+async_vector_store = build_async_jobs_vector_store(vector_store, async_client)
 
-    return int(digits)
 
+# Payload indexes are declared and created by data/qdrant_schema.py (python -m data.qdrant_schema)
 
 # ============================================ Query Functions ============================================
 
-def RAG_query(raw_parameters: dict, _query: str):
+async def RAG_query(raw_parameters: dict, _query: str):
     RAG_parameters = {key: value for key, value in raw_parameters.items() if value is not None}
-    # {"work_style": "Hybrid", "work_type": "Full time", ...}
+    # {"work_style": "Hybrid", "work_type": "Full time", "salary": 10000000, ...}
+
+    # work_style/work_type: exact match on the lowercase keyword-indexed keys
+    # location: full-text match on the text-indexed field
+    # salary: integer range on max_salary, applied by Qdrant during the ANN search (same rule as SQL_search)
+    _must = []
+    for key, value in RAG_parameters.items():
+        if key in ("work_style", "work_type"):
+            condition = models.FieldCondition(
+                key=f"metadata.{key}_key",
+                match=models.MatchValue(value=value.strip().lower())
+            )
+        elif key == "salary":
+            condition = models.FieldCondition(
+                key="metadata.max_salary",
+                range=models.Range(gte=value)
+            )
+        else:
+            condition = models.FieldCondition(
+                key=f"metadata.{key}",
+                match=models.MatchText(text=value)
+            )
 
-    _must = [
-        models.FieldCondition(
-            key=f"metadata.{key}",
-            match=models.MatchText(text=value)
-        )
-        for key, value in RAG_parameters.items()
-    ]
+        _must.append(condition)
 
     metadata_filter = models.Filter(
         must=_must
     )
 
-    points = vector_store.similarity_search(
+    points = await async_vector_store.asimilarity_search(
         query=_query,
         k=5,
         filter=metadata_filter
     )
 
-    list_of_jobs = []
-    for point in points:
-        metadata = point.metadata
-        page_content = point.page_content
+    return [Job.from_document(point) for point in points]
 
-        if "Job Description:" in page_content:
-            job_desc = page_content.split("Job Description: ", 1)[1].strip()
-        else:
-            job_desc = page_content
-
-        Job = {
-            'job_title': metadata["job_title"],
-            'company_name': metadata["company_name"],
-            'work_type': metadata["work_type"],
-            'work_style': metadata["work_style"],
-            'location': metadata["location"],
-            'salary': metadata["salary"],
-            'job_description': job_desc,
-        }
 
-        list_of_jobs.append(Job)
+def SQL_query(raw_parameters: dict):
+    results = job_repository.search(raw_parameters)
 
-    return list_of_jobs
+    return [Job.from_row(row) for row in results]
 
 
-# SELECT
-#     *
-# FROM jobs
-# WHERE job_title LIKE '%' || :job_title || '%'
-#   AND company_name LIKE '%' || :company_name || '%'
-#   AND clean_location LIKE '%' || :location || '%'
-#   AND LOWER(TRIM(work_style)) LIKE LOWER(TRIM(:work_style))
-#   AND LOWER(TRIM(work_type)) LIKE LOWER(TRIM(:work_type))
-#   AND :salary BETWEEN min_salary AND max_salary
-# ORDER BY max_salary DESC
-# LIMIT 5;
 
+# Routes, example queries and tips shared by the entry_point and plan_search prompts
+ROUTE_FILTERS = {
+    "python_filter": "work_style, work_type, min_salary, location",
+    "RAG_search": "work_style, work_type, location, salary",
+    "SQL_search": "job_title, company_name, work_style, work_type, location, salary",
+}
 
-def SQL_query(raw_parameters: dict):
-    conn = sqlite3.connect("data/jobs_database.db")
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+ROUTING_EXAMPLES = """Example queries (they don't have to match, just the overall intent)
 
-    filter = {
-        key: value for key, value in raw_parameters.items() if value is not None
-    }
+        python_filter: 
+        - "build upon the given list by filtering based chosen parameters."
+        - "I like these jobs, but I only want the ones with a provided salary."
+        - "I only want the jobs that are provided in Jakarta."
+        - "I only want Hybrid-type jobs."
 
-    my_list  = [
-        f"{key} LIKE '%' || :{key} || '%'" for key, value in filter.items() if key != "salary"
-    ]
+        RAG_search: 
+        - "Find 10 new jobs with RAG using the user's CV summary that are in Tangerang."
+        - "Find new jobs that match my CV but are only in Jakarta."
+        - "None of these jobs fit me. Find new jobs."  
 
-    x = "\nAND ".join(my_list)
-
-    try:
-        if filter.get("salary"):
-            if not x:
-                x = "max_salary >= :salary"
-            else:    
-                x = x + "\nAND max_salary >= :salary"
-    except Exception:
-        pass
-
-    query = f"""SELECT
-    *
-    FROM jobs
-    WHERE {x}
-    ORDER BY max_salary DESC
-    LIMIT 5;
-    """
-
-    # print(query)
-
-    results = cursor.execute(query, filter).fetchall()
-    # print(results)
-
-    jobs = []
-
-    for row in results:
-        job = {
-            'job_title': row["job_title"],
-            'company_name': row["company_name"],
-            'work_type': row["work_type"],
-            'work_style': row["work_style"],
-            'location': row["location"],
-            'salary': f"""{row["min_salary"]} - {row["max_salary"]}""",
-            'job_description': row["job_description"],
-        }
+        SQL_search: 
+        - "Search for 10 new data analysis jobs in Bandung."
+        - "Find me new jobs fit for a computer science student thats in Jakarta and has a listed salary."
 
-        jobs.append(job)
+        tip: Unless the user asks for "new jobs", its most likely python_filter.
+        tip: SQL_search usually involves directly finding jobs jobs based on titles."""
 
-    return jobs
 
-    
+# Salary unit for every extracted filter; RAG_query and SQL_search compare it against the integer min/max_salary columns
+SALARY_RULE = """- salary and min_salary are monthly salaries in Rupiah as an integer (e.g. "above 10 juta" -> 10000000)."""
 
-# Job = {
-#             'job_title': metadata["job_title"],
-#             'company_name': metadata["company_name"],
-#             'work_type': metadata["work_type"],
-#             'work_style': metadata["work_style"],
-#             'location': metadata["location"],
-#             'salary': metadata["salary"],
-#             'job_desc': job_desc,
-#         }
 
+def routing_instructions(with_filters: bool) -> str:
+    def route(description: str, name: str) -> str:
+        return f"[{description}] -> {name}" + (f" (filters: {ROUTE_FILTERS[name]})" if with_filters else "")
 
+    return f"""{route("Build upon your current list", "python_filter")}
+
+        {route("Find new jobs based on CV", "RAG_search")}
+
+        {route("Find specific jobs you want", "SQL_search")}
+
+        {ROUTING_EXAMPLES}"""
 
 
 # ============================================ Langchain/Langgraph ============================================
 
-def search_compile(initial_state: State):
+def build_search_graph() -> StateGraph:
     search_agent = StateGraph(State)
 
     search_agent.add_node("entry_point", entry_point)
@@ -251,16 +183,21 @@ def search_compile(initial_state: State):
 
     search_agent.set_finish_point("final_check")
 
-    app = search_agent.compile()
-    response = app.invoke(initial_state)
+    return search_agent
 
-    return response
+
+async def search_compile(initial_state: State):
+    # The graph is compiled once (end of this module), requests only invoke it
+    app = get_graph("search")
+    response = await app.ainvoke({**initial_state, "best_jobs": jobs_from_dicts(initial_state.get("best_jobs", []))})
+
+    return {**response, "best_jobs": jobs_to_dicts(response.get("best_jobs", []))}
 
 
 class EntryFormat(BaseModel):
     entry_point: Literal["python_filter", "RAG_search", "SQL_search", "Null intent"]
 
-def entry_point(state: State):
+async def entry_point(state: State):
     user_query = state["query"]
     json_model = model.with_structured_output(EntryFormat)
     
@@ -268,31 +205,7 @@ def entry_point(state: State):
         f"""
         Select the appropriate route for the user query.
 
-        [Build upon your current list] -> python_filter
-
-        [Find new jobs based on CV] -> RAG_search
-
-        [Find specific jobs you want] -> SQL_search
-
-        Example queries (they don't have to match, just the overall intent)
-
-        python_filter: 
-        - "build upon the given list by filtering based chosen parameters."
-        - "I like these jobs, but I only want the ones with a provided salary."
-        - "I only want the jobs that are provided in Jakarta."
-        - "I only want Hybrid-type jobs."
-
-        RAG_search: 
-        - "Find 10 new jobs with RAG using the user's CV summary that are in Tangerang."
-        - "Find new jobs that match my CV but are only in Jakarta."
-        - "None of these jobs fit me. Find new jobs."  
-
-        SQL_search: 
-        - "Search for 10 new data analysis jobs in Bandung."
-        - "Find me new jobs fit for a computer science student thats in Jakarta and has a listed salary."
-
-        tip: Unless the user asks for "new jobs", its most likely python_filter.
-        tip: SQL_search usually involves directly finding jobs jobs based on titles.
+        {routing_instructions(with_filters=False)}
 
         If the query has no matching intent, respond with None.
 
@@ -301,12 +214,28 @@ def entry_point(state: State):
         """
     )
 
-    response = json_model.invoke([system_prompt]).entry_point
+    # Obvious queries are routed locally, the LLM only decides the ambiguous ones
+    route, confidence = classify_query(user_query)
+    fast_path = confidence >= ROUTER_CONFIDENCE_THRESHOLD
+
+    search_params = {}
+
+    if fast_path:
+        response = route
+    elif SINGLE_CALL_ROUTING:
+        system_prompt, plan = await plan_search(user_query)
+        response = plan.route
+        search_params = plan.model_dump(exclude={"route"})
+    else:
+        response = (await llm_cache.aget_or_invoke("EntryFormat", user_query, EntryFormat, lambda: json_model.ainvoke([system_prompt]))).entry_point
+
+    router_stats.record(response, fast_path=fast_path)
 
     print("---------------------")
+    print(f"router: {route} ({confidence:.2f}) -> {'fast path' if fast_path else 'LLM'}")
     print(response)
     print("---------------------")
-    return {"messages": [system_prompt, AIMessage(response)]}
+    return {"messages": [system_prompt, AIMessage(response)], "search_params": search_params}
 
 
 def choose_edge(state: State):
@@ -330,7 +259,7 @@ class FilterFormat(BaseModel):
     min_salary: int | None = None
     location: str | None = None
 
-def python_filter(state: State):
+async def python_filter(state: State):
     print("python_filter was chosen ----------------------\n")
     json_model = model.with_structured_output(FilterFormat)
     system_prompt = SystemMessage(
@@ -343,13 +272,18 @@ def python_filter(state: State):
         - Normalize locations to the least specific valid form (e.g. Jakarta Selatan → Jakarta),
         unless the query explicitly requires specificity.
         - Use exact enum values for work_style and work_type.
+        {SALARY_RULE}
 
         Query:
         {state['query']}
         """
     )
 
-    py_filter = json_model.invoke([system_prompt])
+    # Filters were already extracted together with the route in entry_point
+    if state.get("search_params"):
+        py_filter = FilterFormat(**state["search_params"])
+    else:
+        py_filter = await llm_cache.aget_or_invoke("FilterFormat", state["query"], FilterFormat, lambda: json_model.ainvoke([system_prompt]))
 
     print("py_filter ----------------------")
     print(py_filter) #check
@@ -360,30 +294,22 @@ def python_filter(state: State):
     passed_jobs = []
 
     for job in jobs:
-        title = job["job_title"]
-        print(f"Processing Job: {title} ---------------")
+        print(f"Processing Job: {job.job_title} ---------------")
+        print(f"style = {job.work_style_key}, type = {job.work_type_key}, location {job.location_key}")
 
-        # fields
-        work_style = job["work_style"].lower()
-        work_type  = job["work_type"].lower()
-        location   = job["location"].lower()
-
-        print(f"style = {work_style}, type = {work_type}, location {location}")
-
-        if py_filter.work_style is not None and work_style != py_filter.work_style.lower():
+        if py_filter.work_style is not None and job.work_style_key != py_filter.work_style.lower():
             print("Failed on work_style check...\n")
             continue
 
-        if py_filter.work_type is not None and work_type != py_filter.work_type.lower():
+        if py_filter.work_type is not None and job.work_type_key != py_filter.work_type.lower():
             print("Failed on work_type check...\n")
             continue
 
-        if py_filter.location is not None and py_filter.location.lower() not in location:
+        if py_filter.location is not None and py_filter.location.lower() not in job.location_key:
             print("Failed on location check...\n")
             continue
 
-        job_min_salary = parse_min_salary(job["salary"])
-        print(f"min_salary = {job_min_salary}")
+        print(f"min_salary = {job.min_salary}")
         min_salary_filter = py_filter.min_salary
 
         # User did not specify a salary
@@ -394,11 +320,11 @@ def python_filter(state: State):
             continue
 
         # Skip undisclosed salaries
-        if job_min_salary is None:
+        if job.min_salary is None:
             print("Failed on salary check... (Salary not provided)\n")
             continue
 
-        if min_salary_filter is not None and job_min_salary < min_salary_filter:
+        if job.min_salary < min_salary_filter:
             print("Failed on salary check... (Salary below minimum requirement)\n")
             continue
 
@@ -416,8 +342,9 @@ class RAGFormat(BaseModel):
         "Full time", "Paruh waktu", "Kasual", "Kontrak/Temporer"
     ] | None = None
     location: str | None = None
+    salary: int | None = None
 
-def rag_search(state: State):
+async def rag_search(state: State):
     print("RAG_search was chosen ----------------------\n")
     json_model = model.with_structured_output(RAGFormat)
     system_prompt = SystemMessage(
@@ -430,15 +357,19 @@ def rag_search(state: State):
         - Locations are caps-sensitive. Correct = 'Jakarta Selatan' | Incorrect = 'jakarta selatan'
         - Use exact enum values for work_style and work_type.
         - Generalize locations. Prefer 'Jakarta' over 'Jakart Selatan' unless specified.
+        {SALARY_RULE}
 
         Query:
         {state['query']}
         """
     )
 
-    RAG_parameters = json_model.invoke([system_prompt]).model_dump()
+    if state.get("search_params"):
+        RAG_parameters = RAGFormat(**state["search_params"]).model_dump()
+    else:
+        RAG_parameters = (await llm_cache.aget_or_invoke("RAGFormat", state["query"], RAGFormat, lambda: json_model.ainvoke([system_prompt]))).model_dump()
     print(f"RAG_Parameters: {RAG_parameters}")
-    response = RAG_query(RAG_parameters, state["query"])
+    response = await RAG_query(RAG_parameters, state["query"])
 
     return {"messages": [system_prompt, AIMessage(content=json.dumps(RAG_parameters, ensure_ascii=False, indent=2))], "best_jobs": response}
 
@@ -453,7 +384,7 @@ class SQLFormat(BaseModel):
     location: str | None = None
     salary: int | None = None
 
-def sql_search(state: State):
+async def sql_search(state: State):
     print("SQL_search was chosen ----------------------\n")
     json_model = model.with_structured_output(SQLFormat)
 
@@ -467,6 +398,7 @@ def sql_search(state: State):
         - Locations are caps-sensitive. Correct = 'Jakarta Selatan' | Incorrect = 'jakarta selatan'
         - Use exact enum values for work_style and work_type.
         - Generalize locations. Prefer 'Jakarta' over 'Jakart Selatan' unless specified.
+        {SALARY_RULE}
         - Use the common denominator for Job titles. Consider it as a "keyword detector". So if user wants a data analysis job, simply
         "data" will suffice as: "Data Analyst", "Data Analysis Specialist", and "Data Engineer" could all be valid jobs.
 
@@ -475,15 +407,66 @@ def sql_search(state: State):
         """
     )
 
-    SQL_parameters = json_model.invoke([system_prompt]).model_dump()
+    if state.get("search_params"):
+        SQL_parameters = SQLFormat(**state["search_params"]).model_dump()
+    else:
+        SQL_parameters = (await llm_cache.aget_or_invoke("SQLFormat", state["query"], SQLFormat, lambda: json_model.ainvoke([system_prompt]))).model_dump()
     print(SQL_parameters)
-    response = SQL_query(SQL_parameters)
+    # Local SQLite, but still off the event loop (JobRepository keeps one connection per thread)
+    response = await asyncio.to_thread(SQL_query, SQL_parameters)
 
     # job_title, work_style, work_type, location, 
     return {"messages": [system_prompt, AIMessage(content=json.dumps(SQL_parameters, ensure_ascii=False, indent=2))], "best_jobs": response}
 
 
-def final_check(state: State):
+class FilterPlan(FilterFormat):
+    route: Literal["python_filter"]
+
+class RAGPlan(RAGFormat):
+    route: Literal["RAG_search"]
+
+class SQLPlan(SQLFormat):
+    route: Literal["SQL_search"]
+
+class NullPlan(BaseModel):
+    route: Literal["Null intent"]
+
+# Plain union (anyOf): OpenAI structured outputs don't accept the oneOf a pydantic discriminator generates
+class SearchPlan(BaseModel):
+    plan: FilterPlan | RAGPlan | SQLPlan | NullPlan
+
+async def plan_search(user_query: str):
+    # One structured call that picks the route AND extracts that route's filters,
+    # so the route node doesn't need a second LLM round trip.
+    json_model = model.with_structured_output(SearchPlan)
+    system_prompt = SystemMessage(
+        f"""
+        Select the appropriate route for the user query, and extract that route's filters into the same object.
+
+        {routing_instructions(with_filters=True)}
+
+        If the query has no matching intent, use the "Null intent" route.
+
+        Filter rules:
+        - Only populate a field if explicitly stated; otherwise use None.
+        - Do not infer missing values.
+        - Use exact enum values for work_style and work_type.
+        - Locations are caps-sensitive. Correct = 'Jakarta Selatan' | Incorrect = 'jakarta selatan'
+        - Generalize locations. Prefer 'Jakarta' over 'Jakarta Selatan' unless specified.
+        {SALARY_RULE}
+        - For SQL_search job titles, use the common denominator as a "keyword detector". So if user wants a data analysis job,
+        simply "data" will suffice as: "Data Analyst", "Data Analysis Specialist", and "Data Engineer" could all be valid jobs.
+
+        User query:
+        {user_query}
+        """
+    )
+
+    plan = await llm_cache.aget_or_invoke("SearchPlan", user_query, SearchPlan, lambda: json_model.ainvoke([system_prompt]))
+    return system_prompt, plan.plan
+
+
+async def final_check(state: State):
     if not state["best_jobs"] or state["messages"][-1].content == "Null intent":
         # best jobs is an empty [] 
 
@@ -498,12 +481,15 @@ def final_check(state: State):
             """
         )
 
-        response = model.invoke(state["messages"] + [system_prompt])
+        response = await model.ainvoke(state["messages"] + [system_prompt])
 
         return {"messages": response}
     
     return {}
 
+
+register_graph("search", build_search_graph())
+
 # python filtering functions
 if __name__ == "__main__":
     # Fake Jobs
@@ -594,7 +580,7 @@ if __name__ == "__main__":
 
     print(f"user query: {user_query}\n")
 
-    response = search_compile(initial_state)
+    response = asyncio.run(search_compile(initial_state))
 
     if response["best_jobs"]:
         for job in response["best_jobs"]:
@@ -1,30 +1,31 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List, Dict, Any
 
 # Agents
-from agents.advisor_agent import invoke_advisor
-from agents.document_agent import analysis_compile
-from agents.search_agent import search_compile
+from agents.advisor_agent import invoke_advisor, stream_advisor
+from agents.document_agent import analysis_compile, stream_analysis, analysis_cache
+from agents.search_agent import search_compile, llm_cache
+from agents.router import router_stats
 
 
 from langchain_core.messages import HumanMessage, AIMessage, ToolMessage
 import traceback
+import json
 from livekit import api as livekit_api
 import os
 from dotenv import load_dotenv
-import sqlite3
+from data.job_repository import job_repository, JOB_FIELDS
 
 load_dotenv()
 
 app = FastAPI()
 
-current_dir = os.path.dirname(os.path.abspath(__file__))
-db_path = os.path.join(current_dir, '..', 'data', 'jobs_database.db')
 
-conn = sqlite3.connect(db_path, check_same_thread=False)
-conn.row_factory = sqlite3.Row
-cursor = conn.cursor()
+def sse_event(event: str, data: dict) -> str:
+    # ASCII-escaped JSON, so the event stream decodes the same whatever charset the client assumes
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
 
 
 # ==================================== CV ANALYZER AGENT ====================================
@@ -37,11 +38,45 @@ class CVRequest(BaseModel):
     assessment: str
 
 @app.post("/analyze-cv")
-def cv_analyzer(request: CVRequest):
-    response = analysis_compile(request.model_dump())
+async def cv_analyzer(request: CVRequest):
+    response = await analysis_compile(request.model_dump())
     return response
 
 
+@app.post("/analyze-cv/stream")
+async def cv_analyzer_stream(request: CVRequest):
+    """
+    Server-sent events version of /analyze-cv: one event per graph node as it finishes
+    (read_cache, read_doc, embed_summary, construct_vector, find_jobs, assess_user, write_cache)
+    carrying that node's state update, then done with the full state (same body as /analyze-cv), or error.
+    A cached analysis arrives whole in the read_cache event.
+    """
+    async def events():
+        state = request.model_dump()
+        try:
+            async for node, partial in stream_analysis(state):
+                state.update(partial)
+                yield sse_event(node, partial)
+
+            yield sse_event("done", state)
+
+        except Exception as e:
+            traceback.print_exc()
+            yield sse_event("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/analyze-cv/cache-stats")
+def cv_analyzer_cache_stats():
+    # Re-uploaded CVs answered from the analysis cache
+    return analysis_cache.stats()
+
+
 # ==================================== JOB SEARCHER AGENT ====================================
 class JobSearchRequest(BaseModel):
     query: str
@@ -50,22 +85,55 @@ class JobSearchRequest(BaseModel):
     messages: list
 
 @app.post("/job-search")
-def job_searcher(request: JobSearchRequest):
-    response = search_compile(request.model_dump())
+async def job_searcher(request: JobSearchRequest):
+    response = await search_compile(request.model_dump())
     return response
 
 
+@app.get("/job-search/router-stats")
+def job_search_router_stats():
+    # How many /job-search requests skipped the entry_point LLM call
+    return router_stats.snapshot()
+
+
+@app.get("/job-search/llm-cache-stats")
+def job_search_llm_cache_stats():
+    # Structured LLM outputs served from the cache instead of the model
+    return llm_cache.stats()
+
+
 
 # ==================================== RETRIEVE JOB INFORMATION FROM VECTOR DB / DIRECT ANSWER ====================================
 class ChatRequest(BaseModel):
     messages: List[Dict[str, Any]]
     session_id: str
 
+
+def tool_call_step(tool: dict) -> dict:
+    return {
+        "type": "tool_call",
+        "tool": tool['name'],
+        "message": f"Consulting {tool['name']}..."
+    }
+
+
+def tool_result_step(msg: ToolMessage) -> dict:
+    content_str = str(msg.content)
+
+    # Create a snippet for readability
+    snippet = content_str[:150] + "..." if len(content_str) > 150 else content_str
+    return {
+        "type": "tool_result",
+        "tool": msg.name,
+        "message": f"Received data:\n{snippet}"
+    }
+
+
 @app.post("/invoke-advisor")
-def ask_advisor(request: ChatRequest):
+async def ask_advisor(request: ChatRequest):
     try:
         # Parse Pydantic object
-        result = invoke_advisor(
+        result = await invoke_advisor(
             messages=request.messages,
             session_id=request.session_id
         )
@@ -89,23 +157,11 @@ def ask_advisor(request: ChatRequest):
             if isinstance(msg, AIMessage) and msg.tool_calls:
                 tool_calls = getattr(msg, "tool_calls", [])
                 for tool in tool_calls:
-                    steps_log.append({
-                        "type": "tool_call",
-                        "tool": tool['name'],
-                        "message": f"Consulting {tool['name']}..."
-                    })
+                    steps_log.append(tool_call_step(tool))
 
             # CASE B: The Tool returning data
             elif isinstance(msg, ToolMessage):
-                content_str = str(msg.content)
-
-                # Create a snippet for readability
-                snippet = content_str[:150] + "..." if len(content_str) > 150 else content_str
-                steps_log.append({
-                    "type": "tool_result",
-                    "tool": msg.name,
-                    "message": f"Received data:\n{snippet}"
-                })
+                steps_log.append(tool_result_step(msg))
 
             elif isinstance(msg, HumanMessage):
                 break
@@ -130,6 +186,40 @@ def ask_advisor(request: ChatRequest):
 
 
 
+@app.post("/invoke-advisor/stream")
+async def ask_advisor_stream(request: ChatRequest):
+    """
+    Server-sent events version of /invoke-advisor:
+    tool_call / tool_result events as the agent works, token events for the answer,
+    then done (full answer) or error.
+    """
+    async def events():
+        answer = ""
+        try:
+            async for kind, item in stream_advisor(messages=request.messages, session_id=request.session_id):
+                if kind == "tool_call":
+                    # Text before a tool call is the model thinking out loud, not the answer
+                    answer = ""
+                    yield sse_event("tool_call", tool_call_step(item))
+                elif kind == "tool_result":
+                    yield sse_event("tool_result", tool_result_step(item))
+                else:
+                    answer += item
+                    yield sse_event("token", {"content": item})
+
+            yield sse_event("done", {"response": answer})
+
+        except Exception as e:
+            traceback.print_exc()
+            yield sse_event("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 # ======================================================= GET LIVEKIT TOKEN ===================================================
 class TokenRequest(BaseModel):
     room_name: str
@@ -165,24 +255,77 @@ async def get_livekit_token(req: TokenRequest):
 
 # ====================================================== GET JOBS FROM SQL DB ===============================================
 
-@app.get("/get-all-jobs")
-async def get_all_jobs():
-    
-    cursor.execute("SELECT * FROM jobs")
-    rows = cursor.fetchall()
-    return [
-        {
-            "job_title": row['job_title'],
-            "company_name": row['company_name'],
-            "location": row['clean_location'],
-            "work_style": row['work_style'],
-            "work_type": row['work_type'],
-            "min_salary": row['min_salary'],
-            "max_salary": row['max_salary'],
-            "job_description": row['job_description']
-        }
-        for row in rows
-    ]
-    
+MAX_PAGE_SIZE = 1000
+STREAM_BATCH_SIZE = 500
+
+
+def requested_fields(fields: str | None) -> list[str]:
+    # "job_title, id" -> ["job_title", "id"], validated against JOB_FIELDS
+    selected = [field.strip() for field in (fields or "").split(",") if field.strip()]
+    unknown = [field for field in selected if field not in JOB_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+
+    return selected
+
 
-   
\ No newline at end of file
+def parse_fields(fields: str | None) -> list[str]:
+    selected = requested_fields(fields) or list(JOB_FIELDS)
+    return [field for field in selected if field != "id"]
+
+
+def iter_job_pages(fields: list[str], cursor: int):
+    # One keyset page at a time, so the server only ever holds STREAM_BATCH_SIZE rows
+    while True:
+        rows = job_repository.list_jobs(fields, after_id=cursor, limit=STREAM_BATCH_SIZE)
+        if not rows:
+            break
+
+        yield rows
+        cursor = rows[-1]["id"]
+
+
+def stream_jobs(fields: list[str], cursor: int):
+    for rows in iter_job_pages(fields, cursor):
+        yield "".join(json.dumps(dict(row), ensure_ascii=False) + "\n" for row in rows)
+
+
+@app.get("/get-all-jobs")
+def get_all_jobs(fields: str | None = None):
+    """
+    The whole catalog as one list (the original response shape).
+    - fields: comma-separated projection, e.g. "job_title,company_name,location" to leave out descriptions.
+    Large clients should page with /get-jobs instead.
+    """
+    selected = parse_fields(fields)
+    # The keyset id is only returned when asked for, like before pagination existed
+    columns = ["id"] + selected if "id" in requested_fields(fields) else selected
+
+    return [{column: row[column] for column in columns} for rows in iter_job_pages(selected, 0) for row in rows]
+
+
+@app.get("/get-jobs")
+def get_jobs(
+    cursor: int = 0,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    fields: str | None = None,
+    stream: bool = False,
+):
+    """
+    Pages through the jobs catalog, ordered by id.
+    - cursor: the next_cursor of the previous page (0 for the first page).
+    - fields: comma-separated projection, e.g. "job_title,company_name,location" to leave out descriptions.
+    - stream: return the whole catalog from cursor onwards as NDJSON instead of one page.
+    """
+    selected = parse_fields(fields)
+
+    if stream:
+        return StreamingResponse(stream_jobs(selected, cursor), media_type="application/x-ndjson")
+
+    rows = job_repository.list_jobs(selected, after_id=cursor, limit=limit)
+    next_cursor = rows[-1]["id"] if len(rows) == limit else None
+
+    return {
+        "jobs": [dict(row) for row in rows],
+        "next_cursor": next_cursor,
+    }
@@ -0,0 +1,239 @@
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dotenv import load_dotenv
+from langchain_core.documents import Document
+from qdrant_client import QdrantClient, models
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agents.embedding_cache import cached_embeddings
+from agents.job_record import job_key
+from agents.jobs_vector_store import JOBS_COLLECTION, SPARSE_VECTOR_NAME, CATALOG_VERSION_KEY, BM25SparseEmbeddings, has_sparse_vectors
+from data.preprocess_data import extract_work_style, clean_salary_advanced, DEFAULT_WORK_TYPE
+from data.qdrant_schema import bootstrap
+
+INPUT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "jobs.jsonl")
+CHECKPOINT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ingest_checkpoint.json")
+
+
+def build_job_document(row: dict) -> Document:
+
+    """
+    Fungsi:
+    Membuat Document untuk collection Jobs_Documents dari satu baris jobs.jsonl
+    (format page_content, metadata dan id sama seperti di text_embedding.ipynb).
+    """
+
+    job_title = str(row.get('job_title', ''))
+    company_name = str(row.get('company_name', ''))
+    job_location = str(row.get('location', '')).replace('\n', ' ')
+    job_salary = str(row.get('salary', '')) if row.get('salary') != "None" else "Tidak Ditampilkan"
+    # Missing work_type gets the same default as the SQL table, so both sides filter on the same work_type_key
+    job_type = str(row['work_type']) if row.get('work_type') is not None else DEFAULT_WORK_TYPE
+    work_style = extract_work_style(row.get('location', '')).strip().lower()
+    min_salary, max_salary = clean_salary_advanced(row.get('salary'))
+
+    raw_desc = str(row.get('job_description', ''))
+    clean_desc = " ".join(raw_desc.split())
+
+    doc_id = job_key(job_title, company_name, job_location)
+
+    page_content_template = f"""
+        Job: {job_title}
+        Company: {company_name}
+        Location: {job_location}
+        Salary: {job_salary}
+        Work Type: {job_type}
+        Work Style: {work_style}
+        Job Description: {clean_desc}
+    """.strip()
+
+    metadata_template = {
+        "job_title": job_title,
+        "company_name": company_name,
+        "location": job_location,
+        "salary": job_salary,
+        "work_type": job_type,
+        "work_style": work_style,
+        # Lowercase filter keys, matched exactly against keyword payload indexes (see data/qdrant_schema.py)
+        "work_style_key": work_style,
+        "work_type_key": job_type.strip().lower(),
+        # Parsed like the SQL table (0 = not disclosed), integer-indexed for server-side range filters
+        "min_salary": int(min_salary),
+        "max_salary": int(max_salary),
+    }
+
+    return Document(
+        page_content=page_content_template,
+        metadata=metadata_template,
+        id=doc_id
+    )
+
+
+def read_jobs(input_file: str):
+    # Streams jobs.jsonl one line at a time (the dump doesn't have to fit in memory)
+    with open(input_file, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def batched(rows, batch_size: int):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class Checkpoint:
+
+    """
+    Fungsi:
+    Menyimpan nomor batch yang sudah berhasil di-upsert, supaya ingest yang crash bisa dilanjutkan.
+    Checkpoint di-reset otomatis kalau file input atau batch size berubah.
+    """
+
+    def __init__(self, path: str, input_file: str, batch_size: int):
+        self.path = path
+        stat = os.stat(input_file)
+        self.fingerprint = f"{os.path.abspath(input_file)}:{stat.st_size}:{int(stat.st_mtime)}:{batch_size}"
+        self.done = set()
+
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("fingerprint") == self.fingerprint:
+                self.done = set(data.get("done", []))
+
+    def mark_done(self, batch_number: int):
+        self.done.add(batch_number)
+
+        # Write-then-rename, so a crash never leaves a half-written checkpoint
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"fingerprint": self.fingerprint, "done": sorted(self.done)}, f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        self.done = set()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def upsert_batch(client: QdrantClient, embeddings, sparse_embeddings: BM25SparseEmbeddings, rows: list[dict]) -> int:
+    documents = [build_job_document(row) for row in rows]
+    texts = [doc.page_content for doc in documents]
+
+    # One embeddings request per batch (only cache misses go to OpenAI)
+    dense_vectors = embeddings.embed_documents(texts)
+    sparse_vectors = sparse_embeddings.embed_documents(texts)
+
+    points = [
+        models.PointStruct(
+            id=doc.id,
+            vector={
+                "": dense,
+                SPARSE_VECTOR_NAME: models.SparseVector(indices=sparse.indices, values=sparse.values),
+            },
+            # Same payload layout as QdrantVectorStore, so the agents read these points unchanged
+            payload={"page_content": doc.page_content, "metadata": doc.metadata},
+        )
+        for doc, dense, sparse in zip(documents, dense_vectors, sparse_vectors)
+    ]
+
+    client.upsert(collection_name=JOBS_COLLECTION, points=points, wait=True)
+    return len(points)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Embed jobs.jsonl and upsert it into the Jobs_Documents collection.")
+    parser.add_argument("--input", default=INPUT_FILE)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--concurrency", type=int, default=4, help="batches embedded/upserted in parallel")
+    parser.add_argument("--checkpoint", default=CHECKPOINT_FILE)
+    parser.add_argument("--recreate", action="store_true", help="drop the collection and the checkpoint, start from scratch")
+    args = parser.parse_args()
+
+    load_dotenv()
+    client = QdrantClient(url=os.getenv("QDRANT_ENDPOINT"), api_key=os.getenv("QDRANT_API_KEY"), prefer_grpc=True)
+    checkpoint = Checkpoint(args.checkpoint, args.input, args.batch_size)
+
+    if args.recreate:
+        checkpoint.clear()
+        if client.collection_exists(JOBS_COLLECTION):
+            client.delete_collection(JOBS_COLLECTION)
+
+    # Collection from the declared schema (dense + BM25 sparse vectors, payload indexes); no-op when it exists
+    for problem in bootstrap(client, [JOBS_COLLECTION]):
+        print(problem)
+
+    # A collection built by text_embedding.ipynb has no BM25 vectors, every upsert would fail on the unknown vector name
+    if not has_sparse_vectors(client):
+        print(f"Collection '{JOBS_COLLECTION}' tidak punya sparse vector '{SPARSE_VECTOR_NAME}'. Jalankan ulang dengan: python -m data.ingest_jobs --recreate")
+        sys.exit(1)
+
+    if checkpoint.done:
+        print(f"Melanjutkan dari checkpoint: {len(checkpoint.done)} batch sudah selesai.")
+
+    embeddings = cached_embeddings("text-embedding-3-small")
+    sparse_embeddings = BM25SparseEmbeddings()
+
+    start = time.perf_counter()
+    upserted = 0
+    failed = []
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        in_flight = {}
+
+        def collect(futures):
+            nonlocal upserted
+            for future in futures:
+                batch_number = in_flight.pop(future)
+                try:
+                    upserted += future.result()
+                    checkpoint.mark_done(batch_number)
+                except Exception as e:
+                    failed.append(batch_number)
+                    print(f"Batch {batch_number} gagal: {e}")
+
+            print(f"{upserted} dokumen di-upsert ({upserted / (time.perf_counter() - start):.1f} docs/sec)")
+
+        for batch_number, rows in enumerate(batched(read_jobs(args.input), args.batch_size)):
+            if batch_number in checkpoint.done:
+                continue
+
+            future = executor.submit(upsert_batch, client, embeddings, sparse_embeddings, rows)
+            in_flight[future] = batch_number
+
+            # Bounded: never read more than 2 x concurrency batches ahead of the workers
+            if len(in_flight) >= args.concurrency * 2:
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(finished)
+
+        collect(list(in_flight))
+
+    elapsed = time.perf_counter() - start
+
+    if upserted:
+        # New catalog version: cached CV analyses re-run their job search (agents/analysis_cache.py)
+        catalog_version = time.strftime("%Y%m%dT%H%M%S")
+        client.update_collection(JOBS_COLLECTION, metadata={CATALOG_VERSION_KEY: catalog_version})
+        print(f"Catalog version: {catalog_version}")
+
+    print(f"Selesai: {upserted} dokumen dalam {elapsed:.1f} detik ({upserted / elapsed if elapsed else 0:.1f} docs/sec).")
+
+    if failed:
+        print(f"{len(failed)} batch gagal ({sorted(failed)}). Jalankan ulang perintah yang sama untuk melanjutkan.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+import os
+import re
+import sqlite3
+import threading
+
+DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "jobs_database.db")
+
+# 256 MB: the whole catalog fits, so reads are served from the page cache instead of read() calls
+MMAP_SIZE = 256 * 1024 * 1024
+
+# SQLFormat field -> column of the jobs_fts index
+FTS_COLUMNS = {
+    "job_title": "job_title",
+    "company_name": "company_name",
+    "location": "clean_location",
+}
+
+# API field -> jobs column, for /get-all-jobs and /get-jobs projections
+JOB_FIELDS = {
+    "id": "id",
+    "job_title": "job_title",
+    "company_name": "company_name",
+    "location": "clean_location",
+    "work_style": "work_style",
+    "work_type": "work_type",
+    "min_salary": "min_salary",
+    "max_salary": "max_salary",
+    "job_description": "job_description",
+}
+
+# bm25 weights, in jobs_fts column order (job_title, company_name, clean_location, job_description)
+BM25_WEIGHTS = "10.0, 5.0, 2.0, 1.0"
+
+
+# SELECT
+#     jobs.*
+# FROM jobs_fts
+# JOIN jobs ON jobs.id = jobs_fts.rowid
+# WHERE jobs_fts MATCH 'job_title : "data"* AND clean_location : "jakarta"*'
+#   AND jobs.work_style_key = 'hybrid'
+#   AND jobs.work_type_key = 'full time'
+#   AND jobs.max_salary >= :salary
+# ORDER BY bm25(jobs_fts, 10.0, 5.0, 2.0, 1.0), jobs.max_salary DESC
+# LIMIT 5;
+
+def build_fts_query(filter: dict) -> str:
+    # Every word becomes a quoted prefix term ("data"*) so user input can't inject FTS5 syntax
+    # and "data" still matches "Database", like the old LIKE '%data%' did.
+    terms = []
+    for key, column in FTS_COLUMNS.items():
+        words = re.findall(r"\w+", str(filter.get(key) or ""))
+        terms += [f'{column} : "{word}"*' for word in words]
+
+    return " AND ".join(terms)
+
+
+def build_search_query(raw_parameters: dict, limit: int = 5) -> tuple[str, dict]:
+    filter = {
+        key: value for key, value in raw_parameters.items() if value is not None
+    }
+
+    fts_query = build_fts_query(filter)
+
+    params = {"limit": limit}
+    conditions = []
+
+    # work_style/work_type are compared against their lowercase *_key copies,
+    # so the (work_style_key, work_type_key, max_salary DESC) indexes can be used
+    for key in ("work_style", "work_type"):
+        if key in filter:
+            conditions.append(f"jobs.{key}_key = :{key}")
+            params[key] = str(filter[key]).strip().lower()
+
+    if filter.get("salary"):
+        conditions.append("jobs.max_salary >= :salary")
+        params["salary"] = filter["salary"]
+
+    if fts_query:
+        conditions.insert(0, "jobs_fts MATCH :fts_query")
+        params["fts_query"] = fts_query
+
+        source = "jobs_fts\n    JOIN jobs ON jobs.id = jobs_fts.rowid"
+        order = f"bm25(jobs_fts, {BM25_WEIGHTS}), jobs.max_salary DESC"
+    else:
+        source = "jobs"
+        order = "jobs.max_salary DESC"
+
+    x = "\n    AND ".join(conditions) or "1"
+
+    query = f"""SELECT
+    jobs.*
+    FROM {source}
+    WHERE {x}
+    ORDER BY {order}
+    LIMIT :limit;
+    """
+
+    return query, params
+
+
+def check_query_plans(conn: sqlite3.Connection) -> list[str]:
+    # EXPLAIN QUERY PLAN every SQL_search filter combination without a text filter (those are driven
+    # by jobs_fts) and report the ones that full-scan or sort the jobs table.
+    problems = []
+
+    for work_style in (None, "Hybrid"):
+        for work_type in (None, "Full time"):
+            for salary in (None, 10_000_000):
+                parameters = {"work_style": work_style, "work_type": work_type, "salary": salary}
+                query, params = build_search_query(parameters)
+
+                plan = [row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", params)]
+                if any(step.startswith("SCAN jobs") and "INDEX" not in step for step in plan) \
+                        or any("TEMP B-TREE" in step for step in plan):
+                    problems.append(f"{parameters}: {plan}")
+
+    return problems
+
+
+class JobRepository:
+    """
+    Read-only access to the jobs database, shared by the API and the search agent.
+
+    Every thread gets its own connection (sqlite3 connections must not be shared across threads),
+    opened once and reused, so connection setup is off the hot path. The SQL text of each query
+    only depends on which filters are set, so sqlite3's per-connection statement cache keeps the
+    prepared statements around between calls.
+    """
+
+    def __init__(self, db_path: str = DB_PATH):
+        self.db_path = os.path.abspath(db_path)
+        self._local = threading.local()
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                f"file:{self.db_path}?mode=ro",
+                uri=True,
+                check_same_thread=False,
+                cached_statements=256,
+            )
+            conn.row_factory = sqlite3.Row
+            conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+            conn.execute("PRAGMA query_only = ON")
+            self._local.conn = conn
+
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def search(self, raw_parameters: dict, limit: int = 5) -> list[sqlite3.Row]:
+        query, params = build_search_query(raw_parameters, limit)
+        return self.connection().execute(query, params).fetchall()
+
+    def list_jobs(self, fields: list[str], after_id: int = 0, limit: int = 100) -> list[sqlite3.Row]:
+        # Keyset pagination: "id > :after_id" is a range seek on the primary key,
+        # so every page costs the same no matter how deep into the catalog it is.
+        columns = ", ".join(f"{JOB_FIELDS[field]} AS {field}" for field in ["id"] + fields if field in JOB_FIELDS)
+
+        query = f"SELECT {columns} FROM jobs WHERE id > :after_id ORDER BY id LIMIT :limit"
+        return self.connection().execute(query, {"after_id": after_id, "limit": limit}).fetchall()
+
+
+job_repository = JobRepository()
+
+
+if __name__ == "__main__":
+    problems = check_query_plans(job_repository.connection())
+    print("\n".join(problems) or "All SQL_search filter combinations use an index.")
@@ -1,11 +1,87 @@
 import pandas as pd
+import numpy as np
 import json
 import sqlite3
 import re
 import os
+import sys
+import io
+import hashlib
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from data.job_repository import check_query_plans
+from agents.job_record import job_key
 
 INPUT_FILE = 'jobs.jsonl' 
 DB_NAME = 'jobs_database.db'      
+CHUNK_SIZE = 10_000
+SHARD_BYTES = 64 * 1024 * 1024
+
+# Dipakai juga oleh data/ingest_jobs.py, supaya work_type_key di Qdrant sama dengan di tabel jobs
+DEFAULT_WORK_TYPE = 'Full time'
+
+JOBS_SCHEMA = """
+    DROP TABLE IF EXISTS jobs_fts;
+    DROP TABLE IF EXISTS jobs;
+
+    CREATE TABLE jobs (
+        id              INTEGER PRIMARY KEY,
+        job_key         TEXT    NOT NULL UNIQUE,
+        content_hash    TEXT    NOT NULL,
+        job_title       TEXT    NOT NULL,
+        company_name    TEXT    NOT NULL,
+        clean_location  TEXT    NOT NULL,
+        work_style      TEXT    NOT NULL,
+        work_type       TEXT    NOT NULL,
+        work_style_key  TEXT    NOT NULL,
+        work_type_key   TEXT    NOT NULL,
+        min_salary      INTEGER NOT NULL DEFAULT 0,
+        max_salary      INTEGER NOT NULL DEFAULT 0,
+        job_description TEXT    NOT NULL DEFAULT ''
+    );
+
+    CREATE INDEX idx_jobs_style_type_salary ON jobs (work_style_key, work_type_key, max_salary DESC);
+    CREATE INDEX idx_jobs_style_salary ON jobs (work_style_key, max_salary DESC);
+    CREATE INDEX idx_jobs_type_salary ON jobs (work_type_key, max_salary DESC);
+    CREATE INDEX idx_jobs_salary ON jobs (max_salary DESC);
+"""
+
+SQL_COLUMNS = [
+    'job_title', 
+    'company_name', 
+    'clean_location', 
+    'work_style',     
+    'work_type', 
+    'work_style_key',
+    'work_type_key',
+    'min_salary', 
+    'max_salary',
+    'job_description' 
+]
+
+# Menjaga jobs_fts tetap sinkron saat baris jobs di-insert/update/delete secara incremental
+FTS_TRIGGERS = """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_ai AFTER INSERT ON jobs BEGIN
+        INSERT INTO jobs_fts(rowid, job_title, company_name, clean_location, job_description)
+        VALUES (new.id, new.job_title, new.company_name, new.clean_location, new.job_description);
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_ad AFTER DELETE ON jobs BEGIN
+        INSERT INTO jobs_fts(jobs_fts, rowid, job_title, company_name, clean_location, job_description)
+        VALUES ('delete', old.id, old.job_title, old.company_name, old.clean_location, old.job_description);
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_au AFTER UPDATE ON jobs BEGIN
+        INSERT INTO jobs_fts(jobs_fts, rowid, job_title, company_name, clean_location, job_description)
+        VALUES ('delete', old.id, old.job_title, old.company_name, old.clean_location, old.job_description);
+        INSERT INTO jobs_fts(rowid, job_title, company_name, clean_location, job_description)
+        VALUES (new.id, new.job_title, new.company_name, new.clean_location, new.job_description);
+    END;
+"""
 
 def clean_salary_advanced(salary_text):
 
@@ -84,53 +160,378 @@ def clean_location_name(location_text):
     return text.strip()
 
 
-def main():
-    
-    if not os.path.exists(INPUT_FILE):
-        print(f"File {INPUT_FILE} tidak ditemukan!")
-        return
+# Versi vectorized dari tiga fungsi di atas, untuk satu kolom sekaligus. Nilai salary/location di hasil
+# scrape sangat berulang, jadi kolom di-factorize dulu: parsing (pandas .str + NumPy) hanya dijalankan sekali
+# per nilai unik, lalu hasilnya disebar ke semua baris dengan indexing NumPy.
+# Output identik dengan versi per-baris (dicek oleh misc/benchmark_preprocess.py); fungsi per-baris
+# tetap dipakai sebagai referensi dan oleh data/ingest_jobs.py.
 
-    try:
-        df = pd.read_json(INPUT_FILE, lines=True)
-        print(f"Berhasil load {len(df)} baris data.")
-    except ValueError as e:
-        print(f"Format JSON invalid. Detail: {e}")
-        return
+def clean_salary_series(salary):
+
+    """
+    Fungsi:
+    clean_salary_advanced untuk satu kolom: mengembalikan (min_salary, max_salary) sebagai array int64.
+    """
+
+    # codes -1 (NaN/None) menunjuk ke elemen terakhir: (0, 0), sama seperti versi per-baris
+    codes, uniques = pd.factorize(salary)
+    uniques = pd.Series(uniques, dtype=object)
+    text = uniques.astype(str).str.lower().str.replace(r'[.,]', '', regex=True)
+
+    # Digit non-ASCII (ditangkap \d tapi bukan [0-9]) dan angka yang bisa overflow int64: pakai versi per-baris
+    fallback = text.str.contains(r'(?![0-9])\d|[0-9]{13}', regex=True).to_numpy(dtype=bool)
+
+    multiplier = np.where(text.str.contains('juta|jt', regex=True), 1_000_000, 1)
+
+    numbers = text[~fallback].str.extractall(r'([0-9]+)')[0]
+    positions = numbers.index.get_level_values(0)
+    values = pd.Series(numbers.astype(np.int64).to_numpy() * multiplier[positions], index=positions)
+
+    # Hapus angka yang terlalu kecil (misal tahun atau tanggal), sama seperti versi per-baris
+    values = values[values > 500000]
+    grouped = values.groupby(level=0)
+
+    unique_min = np.append(grouped.min().reindex(uniques.index, fill_value=0).to_numpy(dtype=np.int64), 0)
+    unique_max = np.append(grouped.max().reindex(uniques.index, fill_value=0).to_numpy(dtype=np.int64), 0)
+
+    positions = np.flatnonzero(fallback)
+    if len(positions):
+        fallback_values = [clean_salary_advanced(uniques.iat[position]) for position in positions]
+
+        # Sama seperti apply: angka di luar int64 tetap jadi int Python (kolom object)
+        if any(abs(value) > np.iinfo(np.int64).max for pair in fallback_values for value in pair):
+            unique_min, unique_max = unique_min.astype(object), unique_max.astype(object)
+
+        unique_min[positions] = [pair[0] for pair in fallback_values]
+        unique_max[positions] = [pair[1] for pair in fallback_values]
+
+    return unique_min[codes], unique_max[codes]
+
+
+def extract_work_style_series(location):
+
+    """
+    Fungsi:
+    extract_work_style untuk satu kolom.
+    """
 
+    # codes -1 (NaN/None) menunjuk ke elemen terakhir: 'On-site', sama seperti versi per-baris
+    codes, uniques = pd.factorize(location)
+    text = pd.Series(uniques, dtype=object).astype(str).str.lower()
+
+    styles = np.select(
+        [text.str.contains('jarak jauh|remote', regex=True), text.str.contains('hibrid|hybrid', regex=True)],
+        ['Remote', 'Hybrid'],
+        default='On-site'
+    )
+    return np.append(styles, 'On-site').astype(object)[codes]
+
+
+def clean_location_series(location):
+
+    """
+    Fungsi:
+    clean_location_name untuk satu kolom.
+    """
+
+    codes, uniques = pd.factorize(location)
+    text = pd.Series(uniques, dtype=object).astype(str).str.split('\n', n=1, regex=False).str[0].str.strip()
+
+    result = np.append(text.to_numpy(dtype=object), None)[codes]
+
+    # NaN dan None menghasilkan teks berbeda ('nan' / 'None'), jadi baris kosong diproses per-baris
+    missing = np.flatnonzero(codes == -1)
+    result[missing] = [clean_location_name(location.iat[row]) for row in missing]
+
+    return result
+
+
+def build_fts_index(conn):
+
+    """
+    Fungsi:
+    Membuat index full-text (FTS5) untuk tabel jobs.
+    - SQL_search memakai MATCH + bm25 pada jobs_fts, bukan LIKE '%...%' yang full scan.
+    - External content table: teks tidak diduplikasi, hanya index-nya yang disimpan.
+    """
+
+    conn.executescript("""
+        DROP TABLE IF EXISTS jobs_fts;
+
+        CREATE VIRTUAL TABLE jobs_fts USING fts5(
+            job_title,
+            company_name,
+            clean_location,
+            job_description,
+            content='jobs',
+            content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2',
+            prefix='2 3'
+        );
+
+        INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild');
+        INSERT INTO jobs_fts(jobs_fts) VALUES ('optimize');
+    """)
+    conn.executescript(FTS_TRIGGERS)
+    conn.commit()
+
+
+def prepare_jobs(df):
+
+    """
+    Fungsi:
+    Membersihkan satu DataFrame (atau satu chunk) jobs.jsonl menjadi baris tabel jobs,
+    lengkap dengan job_key dan content_hash.
+    """
+
+    df = df.copy()
+
+    # Dihitung dari nilai mentah, supaya sama dengan id di Qdrant
+    df['job_key'] = [
+        job_key(title, company, location)
+        for title, company, location in zip(df['job_title'], df['company_name'], df['location'])
+    ]
 
     # Standarisasi kolom Salary
-    salary_cleaned = df['salary'].apply(clean_salary_advanced)
-    df['min_salary'] = [x[0] for x in salary_cleaned]
-    df['max_salary'] = [x[1] for x in salary_cleaned]
+    df['min_salary'], df['max_salary'] = clean_salary_series(df['salary'])
     
     # Ekstrak Work Style (Remote/Hybrid)
-    df['work_style'] = df['location'].apply(extract_work_style)
+    df['work_style'] = extract_work_style_series(df['location'])
     
-    # Standarisasi lokasi kerjaNe
-    df['clean_location'] = df['location'].apply(clean_location_name)
+    # Standarisasi lokasi kerja
+    df['clean_location'] = clean_location_series(df['location'])
 
     # Handle Missing Values
     df['company_name'] = df['company_name'].fillna('Unknown Company')
     df['job_title'] = df['job_title'].fillna('Unknown Title')
-    df['work_type'] = df['work_type'].fillna('Full time')
+    df['work_type'] = df['work_type'].fillna(DEFAULT_WORK_TYPE)
+    df['job_description'] = df['job_description'].fillna('')
 
+    # Salinan lowercase untuk filter SQL_search (dipakai oleh composite index)
+    df['work_style_key'] = df['work_style'].str.strip().str.lower()
+    df['work_type_key'] = df['work_type'].str.strip().str.lower()
 
-    conn = sqlite3.connect(DB_NAME)
-    
-    sql_columns = [
-        'job_title', 
-        'company_name', 
-        'clean_location', 
-        'work_style',     
-        'work_type', 
-        'min_salary', 
-        'max_salary',
-        'job_description' 
+    # Hash isi baris: baris yang hash-nya tidak berubah tidak perlu ditulis ulang
+    df['content_hash'] = [
+        hashlib.md5("\x1f".join(str(value) for value in row).encode('utf-8')).hexdigest()
+        for row in df[SQL_COLUMNS].itertuples(index=False, name=None)
     ]
-    
-    df[sql_columns].to_sql('jobs', conn, if_exists='replace', index=False)
+
+    # Job yang sama bisa muncul lebih dari sekali di hasil scrape: yang terakhir dipakai (sama seperti upsert Qdrant)
+    return df.drop_duplicates('job_key', keep='last')
+
+
+TABLE_COLUMNS = ['job_key', 'content_hash'] + SQL_COLUMNS
+
+
+def read_chunks(input_file, chunk_size=CHUNK_SIZE):
+    with pd.read_json(input_file, lines=True, chunksize=chunk_size) as reader:
+        for chunk in reader:
+            yield prepare_jobs(chunk)
+
+
+def shard_ranges(input_file, shard_bytes=SHARD_BYTES):
+
+    """
+    Fungsi:
+    Membagi file JSONL menjadi range byte (start, end) sekitar shard_bytes,
+    dengan batas yang selalu jatuh di awal baris.
+    """
+
+    size = os.path.getsize(input_file)
+    boundaries = [0]
+
+    with open(input_file, 'rb') as f:
+        while boundaries[-1] < size:
+            f.seek(min(boundaries[-1] + shard_bytes, size))
+            f.readline()
+            boundaries.append(min(f.tell(), size))
+
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def clean_shard(input_file, start, end, chunk_size=CHUNK_SIZE):
+
+    """
+    Fungsi:
+    Dijalankan di worker process: membaca satu shard (per chunk_size baris) dan membersihkannya
+    dengan prepare_jobs, sama seperti read_chunks.
+    """
+
+    chunks = []
+    with open(input_file, 'rb') as f:
+        f.seek(start)
+        while f.tell() < end:
+            lines = []
+            while len(lines) < chunk_size and f.tell() < end:
+                line = f.readline()
+                if line.strip():
+                    lines.append(line)
+            if lines:
+                chunk = pd.read_json(io.BytesIO(b"".join(lines)), lines=True)
+                chunks.append(prepare_jobs(chunk)[TABLE_COLUMNS])
+
+    if not chunks:
+        return pd.DataFrame(columns=TABLE_COLUMNS)
+
+    return pd.concat(chunks, ignore_index=True).drop_duplicates('job_key', keep='last')
+
+
+def read_shards(input_file, workers, shard_bytes=SHARD_BYTES):
+
+    """
+    Fungsi:
+    Membersihkan shard-shard file input secara paralel di process pool, lalu mengembalikannya
+    sesuai urutan file ke satu writer SQLite (job duplikat: yang terakhir tetap menang).
+    Paling banyak 2 x workers shard diproses/ditahan sekaligus, jadi memori tidak tergantung ukuran file.
+    """
+
+    ranges = iter(shard_ranges(input_file, shard_bytes))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+
+        for start, end in ranges:
+            pending.append(executor.submit(clean_shard, input_file, start, end))
+            if len(pending) >= workers * 2:
+                break
+
+        while pending:
+            chunk = pending.popleft().result()
+
+            # Shard berikutnya mulai diproses sebelum shard ini selesai ditulis
+            for start, end in ranges:
+                pending.append(executor.submit(clean_shard, input_file, start, end))
+                break
+
+            yield chunk
+
+
+def has_incremental_schema(conn):
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+    triggers = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+    return {'job_key', 'content_hash'} <= columns and 'jobs_fts_ai' in triggers
+
+
+def full_rebuild(conn, chunks):
+
+    """
+    Fungsi:
+    Membuat ulang tabel jobs dan index FTS dari nol.
+    """
+
+    conn.executescript(JOBS_SCHEMA)
+
+    columns = TABLE_COLUMNS
+    placeholders = ", ".join("?" for _ in columns)
+    total = 0
+
+    with conn:
+        for chunk in chunks:
+            conn.executemany(
+                f"INSERT INTO jobs ({', '.join(columns)}) VALUES ({placeholders}) "
+                f"ON CONFLICT(job_key) DO UPDATE SET {', '.join(f'{c} = excluded.{c}' for c in columns[1:])}",
+                chunk[columns].astype(object).itertuples(index=False, name=None)
+            )
+            total += len(chunk)
+
+    build_fts_index(conn)
+    print(f"Berhasil load {total} baris data.")
+
+
+def incremental_update(conn, chunks):
+
+    """
+    Fungsi:
+    Hanya menulis baris yang berubah (berdasarkan content_hash), dalam satu transaksi:
+    - job baru di-insert, job yang isinya berubah di-update, job yang hilang dari jobs.jsonl di-delete.
+    - Pembaca (API) tetap melihat tabel lama sampai commit, tidak pernah tabel kosong.
+    - jobs_fts ikut diperbarui lewat trigger.
+    """
+
+    # Memori tetap sebesar satu chunk: kunci yang sudah terlihat disimpan di tabel temp, bukan di set Python,
+    # dan hash lama dibaca dari tabel jobs per chunk (termasuk yang baru ditulis oleh chunk sebelumnya)
+    seen = inserted = updated = 0
+
+    update_columns = ['content_hash'] + SQL_COLUMNS
+    insert_columns = ['job_key'] + update_columns
+
+    with conn:
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS seen_keys (job_key TEXT PRIMARY KEY)")
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS chunk_keys (job_key TEXT PRIMARY KEY)")
+        conn.execute("DELETE FROM temp.seen_keys")
+
+        for chunk in chunks:
+            keys = [(key,) for key in chunk['job_key']]
+            seen += conn.executemany("INSERT OR IGNORE INTO temp.seen_keys (job_key) VALUES (?)", keys).rowcount
+
+            conn.execute("DELETE FROM temp.chunk_keys")
+            conn.executemany("INSERT OR IGNORE INTO temp.chunk_keys (job_key) VALUES (?)", keys)
+            existing = dict(conn.execute(
+                "SELECT jobs.job_key, jobs.content_hash FROM temp.chunk_keys JOIN jobs ON jobs.job_key = chunk_keys.job_key"
+            ))
+
+            old_hashes = chunk['job_key'].map(existing)
+            new_rows = chunk[old_hashes.isna()]
+            changed_rows = chunk[old_hashes.notna() & (old_hashes != chunk['content_hash'])]
+
+            conn.executemany(
+                f"INSERT INTO jobs ({', '.join(insert_columns)}) VALUES ({', '.join('?' for _ in insert_columns)})",
+                new_rows[insert_columns].astype(object).itertuples(index=False, name=None)
+            )
+            conn.executemany(
+                f"UPDATE jobs SET {', '.join(f'{c} = ?' for c in update_columns)} WHERE job_key = ?",
+                changed_rows[update_columns + ['job_key']].astype(object).itertuples(index=False, name=None)
+            )
+
+            inserted += len(new_rows)
+            updated += len(changed_rows)
+
+        deleted = conn.execute("SELECT COUNT(*) FROM jobs WHERE job_key NOT IN (SELECT job_key FROM temp.seen_keys)").fetchone()[0]
+        conn.execute("DELETE FROM jobs WHERE job_key NOT IN (SELECT job_key FROM temp.seen_keys)")
+
+    print(f"Incremental: {inserted} baru, {updated} berubah, {deleted} dihapus, {seen - inserted - updated} tidak berubah.")
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Build/refresh the SQLite jobs database from jobs.jsonl.")
+    parser.add_argument("--full", action="store_true", help="rebuild the jobs table from scratch instead of an incremental update")
+    parser.add_argument("--workers", type=int, default=0, help="clean byte-range shards of the input in N processes (large dumps)")
+    parser.add_argument("--shard-mb", type=int, default=SHARD_BYTES // (1024 * 1024), help="shard size for --workers")
+    args = parser.parse_args()
+
+    if not os.path.exists(INPUT_FILE):
+        print(f"File {INPUT_FILE} tidak ditemukan!")
+        return
+
+    # Worker process hanya membersihkan data; semua tulisan ke SQLite lewat satu connection di sini
+    if args.workers > 0:
+        chunks = read_shards(INPUT_FILE, args.workers, args.shard_mb * 1024 * 1024)
+    else:
+        chunks = read_chunks(INPUT_FILE)
+
+    conn = sqlite3.connect(DB_NAME)
+
+    try:
+        if args.full or not has_incremental_schema(conn):
+            full_rebuild(conn, chunks)
+        else:
+            incremental_update(conn, chunks)
+    except ValueError as e:
+        print(f"Format JSON invalid. Detail: {e}")
+        conn.close()
+        return
+
+    conn.execute("ANALYZE")
+
+    for problem in check_query_plans(conn):
+        print(f"Query plan tidak memakai index: {problem}")
+
+    # WAL: API/search agent bisa terus membaca (read-only) selama database ditulis ulang
+    conn.execute("PRAGMA journal_mode=WAL")
     conn.close()
     print("Database SQL berhasil dibuat!")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
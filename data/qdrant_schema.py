@@ -0,0 +1,172 @@
+import os
+import sys
+import argparse
+from dotenv import load_dotenv
+from qdrant_client import QdrantClient, models
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agents.jobs_vector_store import JOBS_COLLECTION, SPARSE_VECTOR_NAME, SPARSE_VECTOR_PARAMS
+
+# Single source of truth for the Qdrant collections: vector params and payload indexes.
+# Idempotent: creates what is missing, fixes payload indexes with the wrong type, then verifies.
+#
+#   python -m data.qdrant_schema            create/migrate + verify
+#   python -m data.qdrant_schema --check    verify only (exit code 1 on problems)
+
+CV_COLLECTION = "uploaded_cvs"
+EMBEDDING_SIZE = 1536  # text-embedding-3-small
+
+KEYWORD = models.KeywordIndexParams(type=models.KeywordIndexType.KEYWORD)
+TENANT = models.KeywordIndexParams(type=models.KeywordIndexType.KEYWORD, is_tenant=True)
+INTEGER = models.IntegerIndexParams(type=models.IntegerIndexType.INTEGER, lookup=True, range=True)
+TEXT = models.TextIndexParams(type=models.TextIndexType.TEXT, tokenizer=models.TokenizerType.WORD, lowercase=True)
+
+# Reject filters on fields without a payload index instead of silently scanning the whole collection
+STRICT_MODE = models.StrictModeConfig(enabled=True, unindexed_filtering_retrieve=False)
+
+COLLECTIONS = {
+    JOBS_COLLECTION: {
+        "vectors": {"": models.VectorParams(size=EMBEDDING_SIZE, distance=models.Distance.COSINE)},
+        "sparse_vectors": {SPARSE_VECTOR_NAME: models.SparseVectorParams(**SPARSE_VECTOR_PARAMS)},
+        "payload_indexes": {
+            "metadata.work_style_key": KEYWORD,
+            "metadata.work_type_key": KEYWORD,
+            "metadata.location": TEXT,
+            # Integer salary bounds written by data/ingest_jobs.py, for RAG_query's max_salary range filter
+            "metadata.min_salary": INTEGER,
+            "metadata.max_salary": INTEGER,
+        },
+    },
+    CV_COLLECTION: {
+        "vectors": {"": models.VectorParams(size=EMBEDDING_SIZE, distance=models.Distance.COSINE)},
+        "sparse_vectors": {},
+        "payload_indexes": {
+            "metadata.session_id": TENANT,
+            "metadata.created": INTEGER,
+        },
+    },
+}
+
+
+def _vectors_of(params) -> dict:
+    # An unnamed vector comes back as a bare VectorParams
+    if params is None:
+        return {}
+    return params if isinstance(params, dict) else {"": params}
+
+
+def _schema_type(index_params) -> str:
+    return str(index_params.type.value if hasattr(index_params.type, "value") else index_params.type)
+
+
+def _describe(index_params) -> str:
+    # KeywordIndexParams(is_tenant=True) -> "keyword (is_tenant=True)"
+    options = ", ".join(f"{option}={value}" for option, value in index_params.model_dump(exclude_none=True, mode="json").items() if option != "type")
+    return f"{_schema_type(index_params)} ({options})" if options else _schema_type(index_params)
+
+
+def _params_drift(current, index_params) -> list[str]:
+    # Declared options (is_tenant, lookup/range, tokenizer/lowercase) the existing index doesn't have, as "option=current"
+    declared = index_params.model_dump(exclude_none=True, mode="json")
+    existing = current.params.model_dump(mode="json") if current.params is not None else {}
+    return [f"{option}={existing.get(option)}" for option, value in declared.items() if option != "type" and existing.get(option) != value]
+
+
+def _index_matches(current, index_params) -> bool:
+    return str(current.data_type.value) == _schema_type(index_params) and not _params_drift(current, index_params)
+
+
+def ensure_collection(client: QdrantClient, name: str, spec: dict):
+    if not client.collection_exists(name):
+        print(f"[{name}] creating collection")
+        client.create_collection(
+            collection_name=name,
+            vectors_config=spec["vectors"],
+            sparse_vectors_config=spec["sparse_vectors"] or None,
+        )
+
+    existing = client.get_collection(name).payload_schema
+    for field, index_params in spec["payload_indexes"].items():
+        current = existing.get(field)
+
+        if current is not None and _index_matches(current, index_params):
+            continue
+
+        if current is not None:
+            drift = ", ".join(_params_drift(current, index_params))
+            print(f"[{name}] {field}: replacing {current.data_type.value} index{f' ({drift})' if drift else ''} with {_describe(index_params)}")
+            client.delete_payload_index(collection_name=name, field_name=field, wait=True)
+        else:
+            print(f"[{name}] {field}: creating {_schema_type(index_params)} index")
+
+        client.create_payload_index(collection_name=name, field_name=field, field_schema=index_params, wait=True)
+
+    client.update_collection(collection_name=name, strict_mode_config=STRICT_MODE)
+
+
+def verify_collection(client: QdrantClient, name: str, spec: dict) -> list[str]:
+    if not client.collection_exists(name):
+        return [f"[{name}] collection does not exist"]
+
+    problems = []
+    info = client.get_collection(name)
+
+    vectors = _vectors_of(info.config.params.vectors)
+    for vector_name, params in spec["vectors"].items():
+        current = vectors.get(vector_name)
+        if current is None:
+            problems.append(f"[{name}] missing dense vector '{vector_name}'")
+        elif current.size != params.size or current.distance != params.distance:
+            problems.append(f"[{name}] dense vector '{vector_name}' is {current.size}/{current.distance}, expected {params.size}/{params.distance}")
+
+    sparse_vectors = info.config.params.sparse_vectors or {}
+    for vector_name, params in spec["sparse_vectors"].items():
+        current = sparse_vectors.get(vector_name)
+        if current is None:
+            problems.append(f"[{name}] missing sparse vector '{vector_name}' (re-ingest with python -m data.ingest_jobs --recreate)")
+        elif current.modifier != params.modifier:
+            problems.append(f"[{name}] sparse vector '{vector_name}' modifier is {current.modifier}, expected {params.modifier}")
+
+    for field, index_params in spec["payload_indexes"].items():
+        current = info.payload_schema.get(field)
+        if current is None:
+            problems.append(f"[{name}] missing payload index on {field}")
+        elif str(current.data_type.value) != _schema_type(index_params):
+            problems.append(f"[{name}] {field} is indexed as {current.data_type.value}, expected {_schema_type(index_params)}")
+        elif _params_drift(current, index_params):
+            problems.append(f"[{name}] {field} index has {', '.join(_params_drift(current, index_params))}, expected {_describe(index_params)}")
+
+    return problems
+
+
+def bootstrap(client: QdrantClient, names: list[str] | None = None) -> list[str]:
+    problems = []
+    for name in names or COLLECTIONS:
+        ensure_collection(client, name, COLLECTIONS[name])
+        problems += verify_collection(client, name, COLLECTIONS[name])
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create and verify the Qdrant collections and payload indexes.")
+    parser.add_argument("--check", action="store_true", help="only verify, don't change anything")
+    args = parser.parse_args()
+
+    load_dotenv()
+    client = QdrantClient(url=os.getenv("QDRANT_ENDPOINT"), api_key=os.getenv("QDRANT_API_KEY"))
+
+    if args.check:
+        problems = [problem for name, spec in COLLECTIONS.items() for problem in verify_collection(client, name, spec)]
+    else:
+        problems = bootstrap(client)
+
+    for problem in problems:
+        print(problem)
+    print("Qdrant schema OK." if not problems else f"{len(problems)} problem(s) found.")
+
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
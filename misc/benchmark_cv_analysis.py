@@ -0,0 +1,123 @@
+# Timing check for the CV analysis graph: the CV upsert (construct_vector) in front of find_jobs, as it
+# used to be, versus fanned out next to find_jobs (build_analysis_graph), plus a repeat upload of the same
+# file served by the analysis cache. The OpenAI and Qdrant calls are replaced by sleeps with typical
+# latencies, so only the graph layout is measured
+# (importing the agent still needs the usual .env for its module-level clients).
+#
+# Run from the project root:  python -m misc.benchmark_cv_analysis [runs]
+import sys
+import time
+import base64
+import asyncio
+import statistics
+from langgraph.graph import StateGraph
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage
+
+import agents.document_agent as document_agent
+from agents.document_agent import State, build_analysis_graph
+from agents.analysis_cache import AnalysisCache
+from agents.llm_cache import MemoryCacheBackend
+
+RUNS = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+SAMPLE_CV = "misc/Example CV.pdf"
+
+# Simulated latencies (seconds)
+LLM_SECONDS = 1.5      # read_doc and assess_user, one chat completion each
+EMBED_SECONDS = 0.3    # summary embedding
+UPSERT_SECONDS = 0.4   # uploaded_cvs upsert (wait=True)
+SEARCH_SECONDS = 0.3   # Jobs_Documents query
+
+
+class SleepModel:
+    async def ainvoke(self, messages):
+        await asyncio.sleep(LLM_SECONDS)
+        return AIMessage(content='{"name": "Candidate", "summary": "Preferred Location: Jakarta"}')
+
+
+class SleepEmbeddings:
+    async def aembed_documents(self, texts):
+        await asyncio.sleep(EMBED_SECONDS)
+        return [[0.0] * 1536 for _ in texts]
+
+
+class SleepQdrant:
+    async def upsert(self, **kwargs):
+        await asyncio.sleep(UPSERT_SECONDS)
+
+
+class SleepJobsStore:
+    async def acatalog_version(self):
+        return "1"
+
+    async def asimilarity_search_with_score_by_vector(self, embedding, k=4, filter=None, query=None, **kwargs):
+        await asyncio.sleep(SEARCH_SECONDS)
+        metadata = {"job_title": "Data Analyst", "company_name": "PT Contoh", "work_type": "Full time",
+                    "work_style": "Hybrid", "location": "Jakarta", "salary": "Tidak Ditampilkan"}
+        return [(Document(page_content="Job Description: ...", metadata=metadata), 1.0)] * k
+
+
+def build_sequential_graph() -> StateGraph:
+    # Previous layout: every node on one chain
+    graph = StateGraph(State)
+    nodes = ["read_cache", "read_doc", "embed_summary", "construct_vector", "find_jobs", "assess_user", "write_cache"]
+    for node in nodes:
+        graph.add_node(node, getattr(document_agent, node))
+
+    graph.set_entry_point(nodes[0])
+    for source, target in zip(nodes, nodes[1:]):
+        graph.add_edge(source, target)
+    graph.set_finish_point(nodes[-1])
+
+    return graph
+
+
+class NoCache(AnalysisCache):
+    # Every upload is a new file
+    def get(self, key):
+        return None
+
+
+async def time_graph(app, initial_state) -> list[float]:
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        await app.ainvoke(dict(initial_state))
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+async def main():
+    document_agent.model = SleepModel()
+    document_agent.embedding_model = SleepEmbeddings()
+    document_agent.async_client = SleepQdrant()
+    document_agent.Jobs_VectorStore = SleepJobsStore()
+
+    with open(SAMPLE_CV, "rb") as f:
+        file_bytes = base64.b64encode(f.read()).decode("utf-8")
+
+    initial_state = {
+        "summary": "", "user_name": "", "cv_contents": "", "best_jobs": [],
+        "file_bytes": file_bytes, "session_id": "benchmark", "assessment": "",
+    }
+
+    document_agent.analysis_cache = NoCache(MemoryCacheBackend())
+    sequential = await time_graph(build_sequential_graph().compile(), initial_state)
+    fan_out = await time_graph(build_analysis_graph().compile(), initial_state)
+
+    # First upload fills the cache, the timed ones are repeats. They still embed (here always a sleep,
+    # in the app usually an embedding cache hit) and upsert the CV for the session.
+    document_agent.analysis_cache = AnalysisCache(MemoryCacheBackend())
+    app = build_analysis_graph().compile()
+    await app.ainvoke(dict(initial_state))
+    cached = await time_graph(app, initial_state)
+
+    print(f"{RUNS} runs, llm {LLM_SECONDS}s, embed {EMBED_SECONDS}s, upsert {UPSERT_SECONDS}s, search {SEARCH_SECONDS}s")
+    print(f"  sequential  {statistics.median(sequential):6.2f} s")
+    print(f"  fan-out     {statistics.median(fan_out):6.2f} s")
+    print(f"  saved       {statistics.median(sequential) - statistics.median(fan_out):6.2f} s per CV")
+    print(f"  cached      {statistics.median(cached):6.2f} s (same PDF uploaded again)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
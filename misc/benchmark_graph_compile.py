@@ -0,0 +1,27 @@
+# Micro-benchmark: per-request cost of building + compiling the LangGraph graphs (old behaviour)
+# versus looking up the graph compiled once at import time (graph_registry).
+# Only graph construction is timed, no node is invoked, so no LLM/Qdrant calls are made
+# (importing the agents still needs the usual .env for their module-level clients).
+#
+# Run from the project root:  python -m misc.benchmark_graph_compile
+import time
+
+from agents.graph_registry import get_graph
+from agents.search_agent import build_search_graph
+from agents.document_agent import build_analysis_graph
+
+ITERATIONS = 500
+
+
+def time_per_call(fn) -> float:
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        fn()
+    return (time.perf_counter() - start) / ITERATIONS * 1000
+
+
+for name, builder in (("search", build_search_graph), ("analysis", build_analysis_graph)):
+    before = time_per_call(lambda: builder().compile())
+    after = time_per_call(lambda: get_graph(name))
+
+    print(f"{name:<10} compile per request: {before:8.3f} ms | registry lookup: {after:8.5f} ms")
@@ -0,0 +1,61 @@
+# Offline recall/latency benchmark: dense-only vs hybrid (dense + BM25 sparse, RRF) search on Jobs_Documents.
+# Each sampled job is queried by its exact title (+ company), which is where dense-only search tends
+# to miss; a hit means the job's own point is in the top K.
+#
+# Needs the collection ingested with sparse vectors (python -m data.ingest_jobs) and the usual .env.
+# Run from the project root:  python -m misc.benchmark_hybrid_search
+import os
+import time
+import random
+import statistics
+import pandas as pd
+from dotenv import load_dotenv
+from langchain_qdrant import QdrantVectorStore
+from qdrant_client import QdrantClient
+
+from agents.embedding_cache import cached_embeddings
+from agents.jobs_vector_store import JOBS_COLLECTION, build_jobs_vector_store
+from data.ingest_jobs import INPUT_FILE, build_job_document
+
+K = 5
+SAMPLE_SIZE = 100
+
+load_dotenv()
+client = QdrantClient(url=os.getenv("QDRANT_ENDPOINT"), api_key=os.getenv("QDRANT_API_KEY"))
+embeddings = cached_embeddings("text-embedding-3-small")
+
+stores = {
+    "dense": QdrantVectorStore(client=client, collection_name=JOBS_COLLECTION, embedding=embeddings),
+    "hybrid": build_jobs_vector_store(client, embeddings),
+}
+
+rows = pd.read_json(INPUT_FILE, lines=True).to_dict("records")
+random.seed(42)
+sample = random.sample(rows, min(SAMPLE_SIZE, len(rows)))
+
+queries = []
+for row in sample:
+    doc = build_job_document(row)
+    queries.append((f"{doc.metadata['job_title']} {doc.metadata['company_name']}", doc.id))
+
+# Warm the embedding cache so both modes are timed on search latency, not on the OpenAI call
+for query, _ in queries:
+    embeddings.embed_query(query)
+
+for name, store in stores.items():
+    hits = 0
+    latencies = []
+
+    for query, expected_id in queries:
+        start = time.perf_counter()
+        docs = store.similarity_search(query, k=K)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        ids = [doc.metadata.get("_id", "").replace("-", "") for doc in docs]
+        hits += expected_id in ids
+
+    latencies.sort()
+    print(
+        f"{name:<7} recall@{K}: {hits / len(queries):.3f} | "
+        f"p50: {statistics.median(latencies):7.1f} ms | p95: {latencies[int(len(latencies) * 0.95) - 1]:7.1f} ms"
+    )
@@ -0,0 +1,57 @@
+# Benchmark: filtered top-k job search through Qdrant Cloud vs the in-process NumPy index.
+# Query embeddings are warmed in the embedding cache first, so only the search itself is timed.
+#
+# Needs the usual .env and an exported index (python -m agents.local_vector_index).
+# Run from the project root:  python -m misc.benchmark_local_index
+import os
+import time
+import statistics
+from dotenv import load_dotenv
+from langchain_qdrant import QdrantVectorStore
+from qdrant_client import QdrantClient, models
+
+from agents.embedding_cache import cached_embeddings
+from agents.jobs_vector_store import JOBS_COLLECTION
+from agents.local_vector_index import LocalJobIndex
+
+K = 5
+ROUNDS = 20
+
+QUERIES = [
+    ("data analyst", None),
+    ("backend engineer laravel", None),
+    ("SAP consultant", None),
+    ("marketing staff", models.Filter(must=[models.FieldCondition(key="metadata.location", match=models.MatchText(text="Jakarta"))])),
+    ("software developer", models.Filter(must=[models.FieldCondition(key="metadata.work_style_key", match=models.MatchValue(value="hybrid"))])),
+]
+
+load_dotenv()
+client = QdrantClient(url=os.getenv("QDRANT_ENDPOINT"), api_key=os.getenv("QDRANT_API_KEY"))
+embeddings = cached_embeddings("text-embedding-3-small")
+
+qdrant_store = QdrantVectorStore(client=client, collection_name=JOBS_COLLECTION, embedding=embeddings)
+local_index = LocalJobIndex(embeddings)
+print(f"Local index: {len(local_index)} jobs, matrix {local_index.vectors.shape}")
+
+for query, _ in QUERIES:
+    embeddings.embed_query(query)
+
+overlap = []
+for name, store in (("qdrant", qdrant_store), ("local", local_index)):
+    latencies = []
+    for _ in range(ROUNDS):
+        for query, metadata_filter in QUERIES:
+            start = time.perf_counter()
+            store.similarity_search(query, k=K, filter=metadata_filter)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    latencies.sort()
+    print(f"{name:<7} p50: {statistics.median(latencies):8.2f} ms | p95: {latencies[int(len(latencies) * 0.95) - 1]:8.2f} ms")
+
+# Same top-k? (exact search locally vs HNSW in Qdrant, so small differences are expected)
+for query, metadata_filter in QUERIES:
+    remote = {doc.metadata["_id"] for doc in qdrant_store.similarity_search(query, k=K, filter=metadata_filter)}
+    local = {doc.metadata["_id"] for doc in local_index.similarity_search(query, k=K, filter=metadata_filter)}
+    overlap.append(len(remote & local) / K)
+
+print(f"top-{K} overlap with Qdrant: {statistics.mean(overlap):.2f}")
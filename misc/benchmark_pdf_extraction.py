@@ -0,0 +1,97 @@
+# Benchmark: CV text extraction, old convert_bytes (string concatenation over every page, no budget)
+# versus agents/pdf_text.py, on a generated corpus of multi-page CVs plus misc/Example CV.pdf.
+# Measures single-file latency per CV size, then throughput for a burst of concurrent uploads
+# (threads only, as before, versus aextract_text handing large files to the process pool).
+#
+# Run from the project root:  python -m misc.benchmark_pdf_extraction [uploads]
+import sys
+import time
+import random
+import asyncio
+
+import pymupdf
+
+from agents.pdf_text import extract_text, aextract_text, PDF_MAX_PAGES, PDF_MAX_CHARS, PDF_POOL_MIN_BYTES, PDF_POOL_WORKERS
+
+UPLOADS = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+PAGE_COUNTS = [2, 5, 20, 60]
+SAMPLE_CV = "misc/Example CV.pdf"
+
+WORDS = [
+    "Python", "SQL", "Pandas", "Tableau", "Jakarta", "Bandung", "analyst", "engineer", "managed", "developed",
+    "dashboard", "pipeline", "stakeholders", "marketing", "PT", "Indonesia", "2021", "2023", "led", "team",
+]
+
+
+def old_convert_bytes(file: bytes) -> str:
+    # document_agent.convert_bytes before agents/pdf_text.py
+    doc = pymupdf.open(stream=file, filetype="pdf")
+    text = ""
+    for page in doc:
+        text = text + page.get_text()
+    return text
+
+
+def build_cv(pages: int, photos: bool = False) -> bytes:
+    random.seed(pages)
+    doc = pymupdf.open()
+    for number in range(pages):
+        page = doc.new_page()
+        if photos:
+            # Scanned certificates and photos: incompressible image data makes the file large
+            noise = pymupdf.Pixmap(pymupdf.csRGB, 300, 300, random.randbytes(300 * 300 * 3), False)
+            page.insert_image(pymupdf.Rect(400, 40, 550, 190), pixmap=noise)
+        lines = [f"Experience {number + 1}"]
+        for _ in range(45):
+            lines.append("   ".join(random.choice(WORDS) for _ in range(random.randint(4, 12))))
+            if random.random() < 0.2:
+                lines.append("")
+        page.insert_textbox(page.rect + (50, 50, -50, -50), "\n".join(lines), fontsize=9)
+    return doc.tobytes()
+
+
+def build_corpus() -> dict[str, bytes]:
+    corpus = {f"{pages} pages": build_cv(pages) for pages in PAGE_COUNTS}
+    corpus["8 pages + photos"] = build_cv(8, photos=True)
+    with open(SAMPLE_CV, "rb") as f:
+        corpus["Example CV.pdf"] = f.read()
+    return corpus
+
+
+def time_per_call(fn, file: bytes, repeat: int = 5) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(file)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+async def burst(extract, files: list[bytes]) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*(extract(file) for file in files))
+    return len(files) / (time.perf_counter() - start)
+
+
+async def main():
+    corpus = build_corpus()
+    print(f"budget: {PDF_MAX_PAGES} pages, {PDF_MAX_CHARS:,} chars; "
+          f"process pool of {PDF_POOL_WORKERS} from {PDF_POOL_MIN_BYTES / 1024:.0f} KB (off with 1 worker)")
+
+    print("single file (ms)")
+    for name, file in corpus.items():
+        before, after = time_per_call(old_convert_bytes, file), time_per_call(extract_text, file)
+        chars_before, chars_after = len(old_convert_bytes(file)), len(extract_text(file))
+        print(f"  {name:<16} {len(file) / 1024:7.0f} KB | old {before:7.1f} ms, {chars_before:>8,} chars"
+              f" | new {after:7.1f} ms, {chars_after:>7,} chars")
+
+    # Mixed burst of uploads, as several users hitting /analyze-cv at once
+    files = [random.choice(list(corpus.values())) for _ in range(UPLOADS)]
+    await aextract_text(files[0])  # start the pool outside the timing if the first file needs it
+
+    old = await burst(lambda file: asyncio.to_thread(old_convert_bytes, file), files)
+    threads_only = await burst(lambda file: asyncio.to_thread(extract_text, file), files)
+    engine = await burst(aextract_text, files)
+    print(f"{UPLOADS} concurrent uploads (CV/s): old {old:6.1f} | new, threads only {threads_only:6.1f} | new {engine:6.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
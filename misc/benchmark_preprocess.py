@@ -0,0 +1,93 @@
+# Equivalence check + benchmark: per-row cleaners (DataFrame.apply) vs the vectorized versions in
+# data/preprocess_data.py, on a synthetic 1M-row jobs file: mostly real salary/location values (a scrape
+# repeats them a lot) plus randomly generated messy strings for the edge cases. Exits with code 1 if any row differs.
+#
+# Run from the project root:  python -m misc.benchmark_preprocess [rows]
+import os
+import sys
+import time
+import random
+import tempfile
+import numpy as np
+import pandas as pd
+
+from data.preprocess_data import (
+    clean_salary_advanced, extract_work_style, clean_location_name,
+    clean_salary_series, extract_work_style_series, clean_location_series,
+)
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+FUZZ_RATE = 0.05  # share of rows with generated edge-case strings
+SOURCE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "jobs.jsonl")
+
+SALARY_TOKENS = [
+    "Rp", "IDR", "Rp.", "8.000.000", "12.500.000", "10,000,000", "7", "15", "2025", "500000", "500.001",
+    "juta", "jt", "Jt", "JUTA", "-", "–", "per month", "/bulan", "up to", "World Class Benefits",
+    "٣٠٠٠٠٠٠", "12345678901234567", "0", "", " ", "\n",
+]
+LOCATION_TOKENS = [
+    "Jakarta Selatan", "Bandung", "Surabaya, Jawa Timur", "(Hibrid)", "(Jarak jauh)", "Remote", "HYBRID",
+    "\n", " ", "Tangerang", "  Bekasi  ", "(On-site)",
+]
+
+
+def random_text(tokens, max_tokens):
+    return " ".join(random.choice(tokens) for _ in range(random.randint(0, max_tokens)))
+
+
+def build_synthetic_file(path):
+    source = pd.read_json(SOURCE_FILE, lines=True)
+
+    random.seed(42)
+    salaries = source["salary"].tolist() + [None, "None", "none"]
+    locations = source["location"].tolist() + [None]
+
+    salary = [random.choice(salaries) if random.random() > FUZZ_RATE else random_text(SALARY_TOKENS, 6) for _ in range(ROWS)]
+    location = [random.choice(locations) if random.random() > FUZZ_RATE else random_text(LOCATION_TOKENS, 4) for _ in range(ROWS)]
+
+    pd.DataFrame({"salary": salary, "location": location}).to_json(path, orient="records", lines=True)
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<11} {elapsed:8.2f} s")
+    return result, elapsed
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "jobs_synthetic.jsonl")
+        build_synthetic_file(path)
+        df = pd.read_json(path, lines=True, dtype=False)
+
+    print(f"{len(df):,} rows")
+    mismatches = 0
+
+    print("salary")
+    applied, t_apply = timed("apply", lambda: df["salary"].apply(clean_salary_advanced))
+    (min_salary, max_salary), t_vec = timed("vectorized", lambda: clean_salary_series(df["salary"]))
+    expected_min = np.array([x[0] for x in applied], dtype=object)
+    expected_max = np.array([x[1] for x in applied], dtype=object)
+    mismatches += int(((expected_min != min_salary.astype(object)) | (expected_max != max_salary.astype(object))).sum())
+    print(f"  speedup     {t_apply / t_vec:8.1f}x")
+
+    print("work_style")
+    applied, t_apply = timed("apply", lambda: df["location"].apply(extract_work_style))
+    vectorized, t_vec = timed("vectorized", lambda: extract_work_style_series(df["location"]))
+    mismatches += int((applied.to_numpy() != vectorized).sum())
+    print(f"  speedup     {t_apply / t_vec:8.1f}x")
+
+    print("location")
+    applied, t_apply = timed("apply", lambda: df["location"].apply(clean_location_name))
+    vectorized, t_vec = timed("vectorized", lambda: clean_location_series(df["location"]))
+    mismatches += int((applied.to_numpy() != vectorized).sum())
+    print(f"  speedup     {t_apply / t_vec:8.1f}x")
+
+    print("Output identik." if not mismatches else f"{mismatches} baris berbeda!")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
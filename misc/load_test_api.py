@@ -0,0 +1,129 @@
+# Load test: how many concurrent /job-search, /analyze-cv or /invoke-advisor requests one API worker
+# sustains. Fires the same request at increasing concurrency levels and reports throughput and latency.
+#
+# Start one worker of the build you want to measure, e.g.
+#   uvicorn api.app:app --workers 1 --port 8000
+# then, from the project root:
+#   python -m misc.load_test_api --endpoint job-search --requests 64 --concurrency 1 8 32 64
+#
+# Run it once against the sync handlers (the commit before the async request path) and once against
+# the current build to compare: sync handlers top out at the threadpool size (40 by default) and queue
+# behind it, async handlers keep serving while they wait on OpenAI/Qdrant.
+#
+# Measured for job-search with 128 requests per level, in-process (httpx ASGITransport), OpenAI replaced
+# by a local server answering every chat call after a fixed delay and embeddings after 0.2 s, empty Qdrant:
+#
+#   chat 3 s         concurrency 1          64                      128
+#   sync handlers    0.27 req/s, p50 3.1 s  7.51 req/s, p50 6.3 s   7.33 req/s, p50 9.9 s, p95 16.4 s
+#   async handlers   0.26 req/s, p50 3.1 s  8.78 req/s, p50 4.3 s  12.95 req/s, p50 5.7 s, p95 9.5 s
+#
+#   chat 1 s         concurrency 32         64                      128
+#   sync handlers    16.8 req/s             16.6 req/s              15.1 req/s
+#   async handlers   16.0 req/s             17.5 req/s              19.7 req/s
+#
+# With 1 s calls the worker runs out of CPU (about 50 ms of Python per request) before it runs out of
+# threads, so both builds level off; the threadpool limit shows once the model calls take longer.
+import time
+import base64
+import asyncio
+import argparse
+import statistics
+import httpx
+
+SAMPLE_CV = "misc/Example CV.pdf"
+
+
+# Every request gets its own query/file/message, so the LLM, embedding and analysis caches never answer
+# and each request waits on OpenAI/Qdrant like a first-time request would
+ROLES = ["data analyst", "backend engineer", "digital marketing specialist", "accountant", "UI/UX designer", "HR generalist"]
+CITIES = ["Jakarta", "Bandung", "Surabaya", "Yogyakarta", "Medan", "Bali"]
+
+
+def build_payload(endpoint: str, run_id: str, number: int) -> dict:
+    tag = f"load test {run_id}-{number}"
+
+    if endpoint == "job-search":
+        role, city = ROLES[number % len(ROLES)], CITIES[number // len(ROLES) % len(CITIES)]
+        # Alternates a plain title/location query (SQL_search) with a descriptive one (RAG_search)
+        query = (f"Search for new {role} jobs in {city}" if number % 2 == 0
+                 else f"I want a job in {city} where my {role} experience matters, ideally hybrid")
+        return {
+            "query": f"{query} ({tag})",
+            "summary": "",
+            "best_jobs": [],
+            "messages": [],
+        }
+
+    if endpoint == "analyze-cv":
+        with open(SAMPLE_CV, "rb") as f:
+            # A trailing PDF comment changes the file hash (analysis cache key) but not the parsed text
+            file_bytes = base64.b64encode(f.read() + f"\n%{tag}\n".encode()).decode("utf-8")
+        return {
+            "summary": "",
+            "cv_contents": "",
+            "best_jobs": [],
+            "file_bytes": file_bytes,
+            "session_id": f"load-test-{run_id}-{number}",
+            "assessment": "",
+        }
+
+    if endpoint == "invoke-advisor":
+        return {
+            "messages": [{"role": "user", "content": f"What kind of roles should I look for as a junior {ROLES[number % len(ROLES)]}? ({tag})"}],
+            "session_id": f"load-test-{run_id}-{number}",
+        }
+
+    raise ValueError(f"Unknown endpoint '{endpoint}'")
+
+
+async def run_level(client: httpx.AsyncClient, url: str, payloads: list[dict], concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, errors = [], 0
+
+    async def one_request(payload: dict):
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await client.post(url, json=payload)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+            except httpx.HTTPError:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one_request(payload) for payload in payloads))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p50 = statistics.median(latencies) if latencies else float("nan")
+    p95 = latencies[max(int(len(latencies) * 0.95) - 1, 0)] if latencies else float("nan")
+
+    print(
+        f"concurrency {concurrency:>4} | {len(latencies) / elapsed:7.2f} req/s | "
+        f"p50 {p50:6.2f} s | p95 {p95:6.2f} s | errors {errors}"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Concurrent-request load test for the FastAPI backend.")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--endpoint", default="job-search", choices=["job-search", "analyze-cv", "invoke-advisor"])
+    parser.add_argument("--requests", type=int, default=64, help="requests per concurrency level")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 64])
+    parser.add_argument("--timeout", type=float, default=300)
+    args = parser.parse_args()
+
+    run_id = time.strftime("%H%M%S")
+    url = f"{args.base_url}/{args.endpoint}"
+
+    limits = httpx.Limits(max_connections=max(args.concurrency), max_keepalive_connections=max(args.concurrency))
+    async with httpx.AsyncClient(timeout=args.timeout, limits=limits) as client:
+        print(f"POST {url}, {args.requests} requests per level")
+        for level, concurrency in enumerate(args.concurrency):
+            payloads = [build_payload(args.endpoint, run_id, level * args.requests + number) for number in range(args.requests)]
+            await run_level(client, url, payloads, concurrency)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -29,18 +29,7 @@ qdrant = QdrantVectorStore.from_existing_collection(
 
 client = qdrant.client  # QdrantClient
 
-# client.create_payload_index(
-#     collection_name="uploaded_cvs",
-#     field_name="metadata.created",
-#     field_schema=models.PayloadSchemaType.INTEGER
-# )
-
-# client.create_payload_index(
-#     collection_name="uploaded_cvs",
-#     field_name="metadata.session_id",
-#     field_schema=models.PayloadSchemaType.KEYWORD
-# )
-
+# metadata.created is integer-indexed by data/qdrant_schema.py
 
 # From collection, get points where metadata.created < time now - 30 minutes
 _filter = models.Filter(
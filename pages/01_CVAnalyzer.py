@@ -82,6 +82,69 @@ def get_session_id():
     return ctx.session_id
 
 
+def stream_analysis(initial_state: dict):
+    "Reads the server-sent events of /analyze-cv/stream, yields (event, data) as each step finishes."
+    with requests.post(f"{BACKEND_URL}/analyze-cv/stream", json=initial_state, stream=True) as response:
+        response.raise_for_status()
+
+        event = None
+        for line in response.iter_lines(decode_unicode=True):
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+            elif line.startswith("data: "):
+                yield event, json.loads(line[len("data: "):])
+
+
+def render_personality(assessment: str):
+    st.markdown(
+        f"""
+        <div class="surface">
+            <div style="font-size:42px; font-weight:800; margin-bottom:8px;">
+                {assessment[0:7]}
+            </div>
+            <p style="color:var(--text-muted); line-height:1.7; font-size:16px; margin:0;">
+                {assessment[7:]}
+            </p>
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+
+
+def render_jobs(jobs: list):
+    st.markdown(
+        """
+        <div class="section-title">
+            Recommended Jobs
+        </div>
+        """,
+        unsafe_allow_html=True,
+    )
+
+    for job in jobs:
+        st.markdown(
+            f"""
+            <div class="job-card">
+                <div class="job-title">{job["job_title"]}</div>
+                <div class="job-meta">
+                    {job["company_name"]} &nbsp;|&nbsp;
+                    {job["work_type"]} &nbsp;|&nbsp;
+                    {job["work_style"]} &nbsp;|&nbsp;
+                    {job["salary"]} &nbsp;|&nbsp;
+                    {job["location"]}
+                </div>
+                <details class="job-details">
+                    <summary>Read more</summary>
+                    <div class="job-details-content">
+                        {job["job_description"]}
+                    </div>
+                </details>
+            </div>
+            """,
+            unsafe_allow_html=True
+        )
+
+
 # ======================================================= Streamlit UI =======================================================
 
 # Page Config
@@ -263,12 +326,46 @@ if "analysis_done" not in st.session_state:
         "assessment": ""
     }
 
-    request = requests.post(
-        f"{BACKEND_URL}/analyze-cv",
-        json=initial_state
-    )
-
-    data = request.json()
+    # Results are shown as the backend finishes each step: the recommended jobs are ready
+    # before the personality assessment, so they are rendered first
+    personality_placeholder = st.empty()
+    jobs_placeholder = st.empty()
+    data = None
+    assessed = False
+
+    try:
+        with personality_placeholder.container():
+            st.info("Reading your CV...")
+
+        for event, update in stream_analysis(initial_state):
+            if event == "done":
+                data = update
+                continue
+            if event == "error":
+                st.error(f"CV analysis failed: {update.get('detail')}")
+                continue
+
+            # Rendered by content, not by step: a cached analysis arrives in a single update
+            if "user_name" in update:
+                with personality_placeholder.container():
+                    st.info(f"Hi {update['user_name']}! Finding jobs that match your CV...")
+            if "best_jobs" in update:
+                # A cached analysis with refreshed jobs already has its assessment, assess_user doesn't run
+                if not assessed:
+                    with personality_placeholder.container():
+                        st.info("Assessing your personality...")
+                with jobs_placeholder.container():
+                    render_jobs(update["best_jobs"])
+            if update.get("assessment"):
+                assessed = True
+                with personality_placeholder.container():
+                    render_personality(update["assessment"])
+
+    except Exception as e:
+        st.error(f"Connection failed: {e}")
+
+    if data is None:
+        st.stop()
 
     # Update session state values
     st.session_state["user_summary"] = data["summary"]
@@ -288,62 +385,15 @@ if "analysis_done" not in st.session_state:
 
     save_user_data(mongo_payload)
 
-
-# Update local variables
-MBTI = st.session_state["assessment"][0:7]
-ASSESSMENT = st.session_state["assessment"][7:]
-DUMMY_JOBS = st.session_state["best_jobs"]
+    # Redraw with the full page layout now that every step is done
+    st.rerun()
 
 
 # Personality Insight Card
-st.markdown(
-    f"""
-    <div class="surface">
-        <div style="font-size:42px; font-weight:800; margin-bottom:8px;">
-            {MBTI}
-        </div>
-        <p style="color:var(--text-muted); line-height:1.7; font-size:16px; margin:0;">
-            {ASSESSMENT}
-        </p>
-    </div>
-    """,
-    unsafe_allow_html=True
-)
-
-
+render_personality(st.session_state["assessment"])
 
 # Recommended Jobs
-st.markdown(
-    """
-    <div class="section-title">
-        Recommended Jobs
-    </div>
-    """,
-    unsafe_allow_html=True,
-)
-
-for job in DUMMY_JOBS:
-    st.markdown(
-        f"""
-        <div class="job-card">
-            <div class="job-title">{job["job_title"]}</div>
-            <div class="job-meta">
-                {job["company_name"]} &nbsp;|&nbsp;
-                {job["work_type"]} &nbsp;|&nbsp;
-                {job["work_style"]} &nbsp;|&nbsp;
-                {job["salary"]} &nbsp;|&nbsp;
-                {job["location"]}
-            </div>
-            <details class="job-details">
-                <summary>Read more</summary>
-                <div class="job-details-content">
-                    {job["job_description"]}
-                </div>
-            </details>
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
+render_jobs(st.session_state["best_jobs"])
 
 
 
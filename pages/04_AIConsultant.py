@@ -1,25 +1,32 @@
 # pages/04_AIConsultant.py
 import streamlit as st
 import requests
+import json
 import os
+from itertools import chain
 
 BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:8000")
 # ================================ Helper tool to make code readable ================================
 
-def call_llm(api_url: str):
-    try:
-        response = requests.post(
-            api_url, 
-            json={
-                "messages": st.session_state.consultant_messages,
-                "session_id": st.session_state.session_id
-                }
-            ) 
+def stream_llm(api_url: str):
+    # Reads the server-sent events of /invoke-advisor/stream, yields (event, data) as they arrive
+    with requests.post(
+        api_url,
+        json={
+            "messages": st.session_state.consultant_messages,
+            "session_id": st.session_state.session_id
+            },
+        stream=True,
+        ) as response:
 
-    except Exception as e:
-        st.error(f"Connection failed: {e}")
+        response.raise_for_status()
 
-    return response
+        event = None
+        for line in response.iter_lines(decode_unicode=True):
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+            elif line.startswith("data: "):
+                yield event, json.loads(line[len("data: "):])
 
 
 def show_steps(steps: list):
@@ -253,6 +260,10 @@ for msg in st.session_state.consultant_messages:
             st.markdown(msg["content"])
 print("======================= MESSAGES END HERE =======================\n\n")
 
+# Error of the last request, kept until the next prompt
+if "consultant_error" in st.session_state:
+    st.error(st.session_state.consultant_error)
+
 is_disabled = current_job_title == "None"
 placeholder_text = "Select your prefered job first!" if is_disabled else "What skills should I learn?"
 
@@ -265,6 +276,7 @@ input_disabled = is_disabled or st.session_state.is_processing
 if prompt := st.chat_input(placeholder_text, disabled=input_disabled):
     print("--user inputted a prompt")
     st.session_state.is_processing = True
+    st.session_state.pop("consultant_error", None)
 
     st.session_state.consultant_messages.append({"role": "user", "content": prompt, "steps": []})
 
@@ -273,21 +285,59 @@ if prompt := st.chat_input(placeholder_text, disabled=input_disabled):
 
 
     with st.chat_message("assistant"):
-        with st.spinner("Thinking..."):
-
-            API_URL = f"{BACKEND_URL}/invoke-advisor" 
-            response = call_llm(API_URL)
-
-            if response.status_code == 200:
-                reply = response.json()
-                ans = reply.get("response", "Error")
-                steps = reply.get("steps", [])
-
-                if steps: show_steps(steps)
-                st.markdown(ans)
-                message = {"role": "assistant", "content": ans, "steps": steps if steps else []}
-                st.session_state.consultant_messages.append(message)
-            
-            # Turn off the "busy" switch and refresh
-            st.session_state.is_processing = False
-            st.rerun()
\ No newline at end of file
+        # Tool steps and answer tokens are rendered as they stream in
+        steps_placeholder = st.empty()
+        answer_placeholder = st.empty()
+        steps, ans = [], ""
+        done, error = False, None
+
+        API_URL = f"{BACKEND_URL}/invoke-advisor/stream"
+
+        try:
+            events = stream_llm(API_URL)
+
+            # The spinner only covers the wait for the first event
+            with st.spinner("Thinking..."):
+                first_event = next(events, None)
+
+            for event, data in chain([first_event] if first_event else [], events):
+                if event == "token":
+                    ans += data["content"]
+                    answer_placeholder.markdown(ans + "▌")
+                    continue
+
+                if event == "tool_call":
+                    # Text before a tool call isn't the answer
+                    ans = ""
+                    answer_placeholder.empty()
+                    steps.append(data)
+                elif event == "tool_result":
+                    steps.append(data)
+                elif event == "done":
+                    ans = data.get("response", ans)
+                    done = True
+                elif event == "error":
+                    error = f"Advisor failed: {data.get('detail')}"
+
+                if steps:
+                    with steps_placeholder.container():
+                        show_steps(steps)
+
+        except Exception as e:
+            error = f"Connection failed: {e}"
+
+        answer_placeholder.markdown(ans)
+
+        if ans:
+            message = {"role": "assistant", "content": ans, "steps": steps if steps else []}
+            st.session_state.consultant_messages.append(message)
+
+        # Turn off the "busy" switch
+        st.session_state.is_processing = False
+
+        if error is not None:
+            # No rerun: the error stays on screen, and is shown again on later reruns until the next prompt
+            st.session_state.consultant_error = error
+            st.error(error)
+        elif done:
+            st.rerun()